@@ -0,0 +1,99 @@
+"""Compare error response throughput with and without debug tracebacks.
+
+This makes requests that fail with a 400 for an invalid sort and with a 422
+for an invalid body, in testing mode with and without
+``RESTY_ERROR_TRACEBACKS``, and outside of testing mode. It also times
+raising errors that are caught without being rendered.
+
+    python benchmarks/errors.py
+"""
+
+import functools
+import json
+
+from marshmallow import fields, Schema
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import Api, ApiError, GenericModelView, Sorting
+
+from utils import create_app, create_db, run_benchmark
+
+# -----------------------------------------------------------------------------
+
+
+def create_benchmark_app(**config):
+    app = create_app(**config)
+    db = create_db(app)
+
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String, nullable=False)
+
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String(required=True)
+
+    class WidgetListView(GenericModelView):
+        model = Widget
+        schema = WidgetSchema()
+
+        sorting = Sorting('name')
+
+        def get(self):
+            return self.list()
+
+        def post(self):
+            return self.create()
+
+    api = Api(app)
+    api.add_resource('/widgets', WidgetListView)
+
+    return app
+
+
+def raise_caught_error():
+    try:
+        try:
+            raise ValueError()
+        except ValueError:
+            raise ApiError(400, {'code': 'invalid_value'})
+    except ApiError:
+        pass
+
+
+def main():
+    for name, config in (
+        ('testing', {'TESTING': True}),
+        ('testing, no tracebacks', {
+            'TESTING': True,
+            'RESTY_ERROR_TRACEBACKS': False,
+        }),
+        ('production', {}),
+    ):
+        app = create_benchmark_app(**config)
+        client = app.test_client()
+
+        get_invalid_sort = functools.partial(client.get, '/widgets?sort=id')
+        assert get_invalid_sort().status_code == 400
+
+        post_invalid_body = functools.partial(
+            client.post,
+            '/widgets',
+            data=json.dumps({'data': {}}),
+            content_type='application/json',
+        )
+        assert post_invalid_body().status_code == 422
+
+        run_benchmark('{}, 400'.format(name), get_invalid_sort, 1000)
+        run_benchmark('{}, 422'.format(name), post_invalid_body, 1000)
+
+        with app.app_context():
+            run_benchmark(
+                '{}, caught'.format(name), raise_caught_error, 10000,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Compare serialization throughput of the JSON backends.
+
+This dumps and loads a page of items like those rendered by a list view with
+each registered backend.
+
+    python benchmarks/json_backends.py
+"""
+
+import datetime
+import functools
+import uuid
+
+from flask_resty.json_backends import get_json_backend
+
+from utils import create_app, run_benchmark
+
+NUM_ITEMS = 100
+
+# -----------------------------------------------------------------------------
+
+
+def make_body():
+    return {
+        'data': [
+            {
+                'id': str(i),
+                'name': "Widget {}".format(i),
+                'size': i * 1.5,
+                'tags': ['foo', 'bar', 'baz'],
+                'created_at': datetime.datetime(2018, 1, 2, 3, 4, 5),
+                'owner': {
+                    'id': str(uuid.UUID(int=i)),
+                    'active': i % 2 == 0,
+                },
+            }
+            for i in range(NUM_ITEMS)
+        ],
+        'meta': {
+            'has_next_page': True,
+            'cursors': ['MQ.MQ'] * NUM_ITEMS,
+        },
+    }
+
+
+def main():
+    body = make_body()
+
+    for backend_name in ('stdlib', 'orjson'):
+        app = create_app(RESTY_JSON_BACKEND=backend_name)
+
+        with app.app_context():
+            try:
+                backend = get_json_backend()
+            except KeyError:
+                print('{:<40} not installed'.format(backend_name))
+                continue
+
+            body_raw = backend.dumps(body)
+
+            run_benchmark(
+                '{} dumps'.format(backend_name),
+                functools.partial(backend.dumps, body),
+                1000,
+            )
+            run_benchmark(
+                '{} loads'.format(backend_name),
+                functools.partial(backend.loads, body_raw),
+                1000,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Compare cursor pagination filters on deep pages.
+
+This requests a page near the end of a large table, sorted by a non-unique
+column, with both the OR of ANDs filter and the row value filter.
+
+Run against Postgres by setting ``DATABASE_URL``; SQLite is used otherwise.
+
+    python benchmarks/keyset_pagination.py
+"""
+
+import functools
+
+from marshmallow import fields, Schema
+from sqlalchemy import Column, Index, Integer
+
+from flask_resty import Api, GenericModelView, RelayCursorPagination, Sorting
+
+from utils import create_app, create_db, run_benchmark
+
+NUM_WIDGETS = 100000
+PAGE_SIZE = 100
+
+# -----------------------------------------------------------------------------
+
+app = create_app()
+db = create_db(app)
+
+
+class Widget(db.Model):
+    __tablename__ = 'widgets'
+
+    id = Column(Integer, primary_key=True)
+    size = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('ix_widgets_size_id', 'size', 'id'),
+    )
+
+
+class WidgetSchema(Schema):
+    id = fields.Integer(as_string=True)
+    size = fields.Integer()
+
+
+class WidgetListView(GenericModelView):
+    model = Widget
+    schema = WidgetSchema()
+
+    sorting = Sorting('size')
+    pagination = RelayCursorPagination(PAGE_SIZE)
+
+    def get(self):
+        return self.list()
+
+
+class RowValueWidgetListView(WidgetListView):
+    pagination = RelayCursorPagination(PAGE_SIZE, use_row_values=True)
+
+
+api = Api(app)
+api.add_resource('/widgets', WidgetListView)
+api.add_resource('/row_value_widgets', RowValueWidgetListView)
+
+# -----------------------------------------------------------------------------
+
+
+def create_widgets():
+    db.drop_all()
+    db.create_all()
+
+    db.session.bulk_insert_mappings(Widget, (
+        {'id': i, 'size': i % 1000} for i in range(1, NUM_WIDGETS + 1)
+    ))
+    db.session.commit()
+
+
+def get_deep_cursor():
+    widget = Widget.query.order_by(
+        Widget.size, Widget.id,
+    ).offset(NUM_WIDGETS - 2 * PAGE_SIZE).first()
+
+    return WidgetListView.pagination.encode_cursor((widget.size, widget.id))
+
+
+def main():
+    with app.app_context():
+        create_widgets()
+        cursor = get_deep_cursor()
+
+        client = app.test_client()
+
+        for name, path in (
+            ("or of ands", '/widgets'),
+            ("row values", '/row_value_widgets'),
+        ):
+            url = '{}?sort=size&cursor={}'.format(path, cursor)
+            assert client.get(url).status_code == 200
+
+            run_benchmark(name, functools.partial(client.get, url), 200)
+
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
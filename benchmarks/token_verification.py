@@ -0,0 +1,101 @@
+"""Compare token verification throughput of `JwkSetAuthentication`.
+
+This verifies tokens against a JWK set with many keys, parsing the key for
+every token as a baseline, then with the parsed key cache, then also with a
+token cache.
+
+    python benchmarks/token_verification.py
+"""
+
+import functools
+import json
+import os
+
+import jwt
+
+from flask_resty import JwkSetAuthentication, TokenCache
+from flask_resty.jwt import JwkSetCache
+
+from utils import create_app, run_benchmark
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'fixtures',
+)
+
+NUM_OTHER_KEYS = 20
+
+# -----------------------------------------------------------------------------
+
+
+class UncachedJwkSetAuthentication(JwkSetAuthentication):
+    def get_jwk_set_cache(self):
+        return JwkSetCache(self.get_jwk_set())
+
+    def get_key(self, jwk_set_cache, jwk, alg):
+        return self.get_key_from_jwk(jwk, self.algorithms[alg])
+
+
+# -----------------------------------------------------------------------------
+
+
+def load_fixture(file_name):
+    with open(os.path.join(FIXTURES_DIR, file_name), 'r') as fixture_file:
+        return fixture_file.read()
+
+
+def load_jwk_set(file_name):
+    jwks = json.loads(load_fixture(file_name))['keys']
+    jwk = next(jwk for jwk in jwks if jwk['kid'] == 'foo.com')
+
+    # Put the fixture keys behind keys for other key IDs.
+    other_jwks = [
+        dict(jwk, kid='other{}.com'.format(i)) for i in range(NUM_OTHER_KEYS)
+    ]
+    return {'keys': other_jwks + jwks}
+
+
+def make_token():
+    token = jwt.encode(
+        {'iss': 'resty', 'sub': 'foo'},
+        load_fixture('testkey_rsa_priv.pem'),
+        algorithm='RS256',
+        headers={'kid': 'foo.com'},
+    )
+
+    # PyJWT < 2 returns bytes.
+    return token.decode() if isinstance(token, bytes) else token
+
+
+def main():
+    token = make_token()
+
+    for jwk_set_name, file_name in (
+        ('public key', 'testkey_rsa_pub.json'),
+        ('certificate', 'testkey_rsa_cert.json'),
+    ):
+        app = create_app(
+            RESTY_JWT_DECODE_JWK_SET=load_jwk_set(file_name),
+            RESTY_JWT_DECODE_ALGORITHMS=['RS256'],
+        )
+
+        with app.app_context():
+            for name, authentication in (
+                ('no key cache', UncachedJwkSetAuthentication(
+                    issuer='resty',
+                )),
+                ('key cache', JwkSetAuthentication(issuer='resty')),
+                ('key and token cache', JwkSetAuthentication(
+                    issuer='resty', token_cache=TokenCache(),
+                )),
+            ):
+                assert authentication.get_token_payload(token)['sub'] == 'foo'
+
+                run_benchmark(
+                    '{}, {}'.format(jwk_set_name, name),
+                    functools.partial(authentication.get_token_payload, token),
+                    500,
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import os
+import timeit
+
+from flask import Flask
+import flask_sqlalchemy as fsa
+
+# -----------------------------------------------------------------------------
+
+
+def create_app(**config):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+        'DATABASE_URL',
+        'sqlite://',
+    )
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.update(config)
+
+    return app
+
+
+def create_db(app):
+    return fsa.SQLAlchemy(app)
+
+
+# -----------------------------------------------------------------------------
+
+
+def run_benchmark(name, func, number, repeat=3):
+    """Time `func` and print its best throughput over `repeat` runs."""
+    seconds = min(timeit.repeat(func, number=number, repeat=repeat))
+    print('{:<40} {:>10.0f}/s {:>10.1f} us'.format(
+        name, number / seconds, seconds / number * 1e6,
+    ))
@@ -9,17 +9,31 @@ from .authorization import (
     HasCredentialsAuthorizationBase,
     NoOpAuthorization,
 )
+from .caching import (
+    CacheStoreBase,
+    ListCache,
+    MemoryCacheStore,
+    SerializedItemCache,
+)
 from .decorators import get_item_or_404
 from .exceptions import ApiError
 from .fields import RelatedItem
 from .filtering import (
     ArgFilterBase,
     ColumnFilter,
+    ColumnRangeFilter,
     FieldFilterBase,
     Filtering,
     model_filter,
     ModelFilter,
+    OperatorFilters,
+)
+from .instrumentation import (
+    get_request_metrics,
+    Instrumentation,
+    RequestMetrics,
 )
+from .loading import LoadPlanner
 from .pagination import (
     CursorPaginationBase,
     LimitOffsetPagination,
@@ -29,10 +43,22 @@ from .pagination import (
     RelayCursorPagination,
 )
 from .related import Related, RelatedId
+from .search import (
+    Fts5SearchIndex,
+    SearchFilter,
+    SearchIndexBase,
+    TsvectorSearchIndex,
+)
 from .sorting import FieldSortingBase, FixedSorting, Sorting, SortingBase
 from .view import ApiView, GenericModelView, ModelView
 
 try:
-    from .jwt import JwtAuthentication, JwkSetAuthentication
+    from .jwt import (
+        JwkSetAuthentication,
+        JwkSetProviderBase,
+        JwtAuthentication,
+        RemoteJwkSetProvider,
+        TokenCache,
+    )
 except ImportError:
     pass
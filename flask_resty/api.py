@@ -102,6 +102,12 @@ class Api(object):
         app = self._get_app(app)
         endpoint = self._get_endpoint(base_view, alternate_view)
 
+        # Resolve the per-class request state up front rather than on the
+        # first request.
+        self._prepare_view(base_view)
+        if alternate_view:
+            self._prepare_view(alternate_view)
+
         # Store the view rules for reference. Doesn't support multiple routes
         # mapped to same view.
         views = app.extensions['resty'].views
@@ -136,6 +142,10 @@ class Api(object):
         views[base_view] = Resource(base_view, base_rule_full)
         views[alternate_view] = Resource(alternate_view, alternate_rule_full)
 
+    def _prepare_view(self, view):
+        if hasattr(view, 'get_request_plan'):
+            view.get_request_plan()
+
     def _get_endpoint(self, base_view, alternate_view):
         base_view_name = base_view.__name__
         if not alternate_view:
@@ -0,0 +1,290 @@
+import collections
+import hashlib
+import numbers
+import threading
+import time
+import uuid
+import weakref
+
+import flask
+import sqlalchemy as sa
+
+from .compat import basestring
+
+# -----------------------------------------------------------------------------
+
+_class_keys = weakref.WeakKeyDictionary()
+_class_keys_lock = threading.Lock()
+
+# -----------------------------------------------------------------------------
+
+
+class CacheStoreBase(object):
+    """A store for cached values.
+
+    Subclass this to keep cached values in an external store such as Redis or
+    memcached. Keys are strings, and values must be serializable by the store.
+    """
+
+    def get(self, key):
+        """Get the value for the key, or `None` if it is not cached."""
+        raise NotImplementedError()
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError()
+
+    def delete(self, key):
+        raise NotImplementedError()
+
+
+class MemoryCacheStore(CacheStoreBase):
+    """A bounded in-process LRU store.
+
+    :param int max_size: The maximum number of values to store.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.time()
+
+        with self._lock:
+            try:
+                value, expires_at = self._entries.pop(key)
+            except KeyError:
+                return None
+
+            if expires_at is not None and now >= expires_at:
+                return None
+
+            # Reinsert the entry to mark it as most recently used.
+            self._entries[key] = (value, expires_at)
+
+        return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# -----------------------------------------------------------------------------
+
+
+class ListCache(object):
+    """A cache for serialized list responses.
+
+    Entries are keyed by the view class, the request credentials, the URL
+    parameters, and the request args used for filtering, sorting, and
+    pagination, so unrelated query args don't fragment the cache.
+
+    Credentials must map to a stable identifier, as two users must never
+    share a key. Strings, integers, and `None` are used as they are. For
+    other credentials, override `get_credentials_identity` to return a
+    stable identifier such as the user ID.
+
+    View classes are keyed by an identifier unique to the class in this
+    process. Override `get_view_key` to share entries across processes.
+
+    Each model has a generation that is part of every key. Invalidating a
+    model starts a new generation, so stale entries are never read again,
+    even from stores that can't enumerate or delete them by prefix.
+
+    :param store: The `CacheStoreBase` for entries. Defaults to a
+        `MemoryCacheStore`.
+    :param ttl: The maximum number of seconds to cache a response.
+    """
+
+    def __init__(self, store=None, ttl=60):
+        self.store = store if store is not None else MemoryCacheStore()
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self.store.set(key, value, self.ttl)
+
+    def invalidate(self, model):
+        """Invalidate all cached lists of the model."""
+        self.store.set(self.get_generation_key(model), self.make_generation())
+
+    def get_key(self, view):
+        key = (
+            self.get_generation(view.model),
+            self.get_view_key(view),
+            self.get_credentials_key(view),
+            self.get_view_args_key(view),
+            self.get_args_key(view),
+        )
+        return 'list:{}'.format(
+            hashlib.sha256(repr(key).encode('utf-8')).hexdigest(),
+        )
+
+    def get_generation(self, model):
+        generation_key = self.get_generation_key(model)
+        generation = self.store.get(generation_key)
+
+        if generation is None:
+            # A generation that was evicted can't be treated as the initial
+            # one, or invalidated entries could become visible again.
+            generation = self.make_generation()
+            self.store.set(generation_key, generation)
+
+        return generation
+
+    def get_generation_key(self, model):
+        # Key by table, so the generation is shared by every model on it, and
+        # across processes using the same store.
+        table = sa.inspect(model).base_mapper.local_table
+        return 'list_generation:{}'.format(table.fullname)
+
+    def make_generation(self):
+        return uuid.uuid4().hex
+
+    def get_view_key(self, view):
+        return get_class_key(type(view))
+
+    def get_credentials_key(self, view):
+        credentials = view.authorization.get_request_credentials()
+        identity = self.get_credentials_identity(credentials)
+
+        return (type(identity).__name__, identity)
+
+    def get_credentials_identity(self, credentials):
+        """Get a stable identifier for the credentials.
+
+        Override this for credentials other than strings and integers.
+        """
+        if credentials is None or isinstance(
+            credentials, (basestring, numbers.Integral),
+        ):
+            return credentials
+
+        raise TypeError(
+            "cannot determine cache key for credentials of type {}; "
+            "override get_credentials_identity".format(
+                type(credentials).__name__,
+            ),
+        )
+
+    def get_view_args_key(self, view):
+        view_args = flask.request.view_args or {}
+        return tuple(sorted(view_args.items()))
+
+    def get_args_key(self, view):
+        args = flask.request.args
+        return tuple(
+            (arg_name, tuple(args.getlist(arg_name)))
+            for arg_name in sorted(self.get_arg_names(view))
+            if arg_name in args
+        )
+
+    def get_arg_names(self, view):
+        arg_names = set()
+
+        for component in (view.filtering, view.sorting, view.pagination):
+            if component is not None:
+                arg_names.update(component.get_arg_names())
+
+        if view.fields_arg:
+            arg_names.add(view.fields_arg)
+
+        if view.args_schema is not None:
+            arg_names.update(
+                load_from or field_name
+                for field_name, load_from, _ in
+                view.get_request_plan().get_args_fields(view)
+            )
+
+        return arg_names
+
+
+# -----------------------------------------------------------------------------
+
+
+class SerializedItemCache(object):
+    """A cache for serialized items.
+
+    Entries are keyed by the serializer, the item id, and the item version, so
+    changing an item also changes its key. Cached items are shared, so they
+    must not be modified.
+
+    Nested items are part of the cached item, so changes to them are only
+    picked up if they also change the version of the item.
+
+    :param store: The `CacheStoreBase` for entries. Defaults to a
+        `MemoryCacheStore`.
+    :param ttl: The maximum number of seconds to cache an item, or `None` to
+        cache items until they are evicted.
+    """
+
+    def __init__(self, store=None, ttl=None):
+        self.store = store if store is not None else MemoryCacheStore()
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self.store.set(key, value, self.ttl)
+
+    def delete(self, key):
+        self.store.delete(key)
+
+    def get_key(self, serializer, id, version):
+        key = (self.get_serializer_key(serializer), id, version)
+        return 'item:{}'.format(
+            hashlib.sha256(repr(key).encode('utf-8')).hexdigest(),
+        )
+
+    def get_serializer_key(self, serializer):
+        # Schemas of the same class can still dump different fields.
+        only = serializer.only
+        return (
+            get_class_key(type(serializer)),
+            tuple(sorted(only)) if only is not None else None,
+            tuple(sorted(serializer.exclude)),
+        )
+
+
+# -----------------------------------------------------------------------------
+
+
+def get_class_key(cls):
+    """Get a key that is unique to the class in this process.
+
+    Classes from factories or closures can share a name, so the name alone
+    doesn't identify them.
+    """
+    with _class_keys_lock:
+        try:
+            return _class_keys[cls]
+        except KeyError:
+            pass
+
+        class_key = '{}.{}:{}'.format(
+            cls.__module__, cls.__name__, uuid.uuid4().hex,
+        )
+        _class_keys[cls] = class_key
+        return class_key
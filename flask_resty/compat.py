@@ -10,3 +10,13 @@ if PY2:
     basestring = basestring  # noqa: F821
 else:
     basestring = (str, bytes)
+
+if PY2:
+    from urllib2 import urlopen  # noqa: F401
+else:
+    from urllib.request import urlopen  # noqa: F401
+
+if PY2:
+    from time import time as perf_counter  # noqa: F401
+else:
+    from time import perf_counter  # noqa: F401
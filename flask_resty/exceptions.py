@@ -1,8 +1,11 @@
+import sys
 import traceback
 
 import flask
 from werkzeug.exceptions import default_exceptions
 
+from . import json_backends
+
 # -----------------------------------------------------------------------------
 
 
@@ -13,8 +16,20 @@ class ApiError(Exception):
             'errors': errors or self.get_default_errors(status_code),
         }
 
-        if flask.current_app.debug or flask.current_app.testing:
-            self.body['debug'] = traceback.format_exc()
+        # Formatting the traceback is expensive, so just hold on to the
+        # exception info here, and only format it when rendering a response.
+        if self.should_include_traceback():
+            self._exc_info = sys.exc_info()
+        else:
+            self._exc_info = None
+
+    @classmethod
+    def should_include_traceback(cls):
+        app = flask.current_app
+        if not app.config.get('RESTY_ERROR_TRACEBACKS', True):
+            return False
+
+        return app.debug or app.testing
 
     @classmethod
     def from_http_exception(cls, exc):
@@ -47,4 +62,10 @@ class ApiError(Exception):
         if flask.current_app.config.get('RESTY_TRAP_API_ERRORS'):
             raise self
 
-        return flask.jsonify(self.body), self.status_code
+        if self._exc_info is not None:
+            self.body['debug'] = ''.join(
+                traceback.format_exception(*self._exc_info)
+            )
+            self._exc_info = None
+
+        return json_backends.jsonify(self.body), self.status_code
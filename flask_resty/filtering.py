@@ -1,14 +1,26 @@
+import collections
 import copy
 import functools
+import operator
+import threading
 
 import flask
 import marshmallow
-from marshmallow import ValidationError
+from marshmallow import fields, ValidationError
 import sqlalchemy as sa
 from sqlalchemy import sql
 
+from .compat import basestring
 from .exceptions import ApiError
-from .utils import iter_validation_errors
+from .utils import iter_validation_errors, UNDEFINED
+
+EQUALITY_OPERATORS = frozenset((operator.eq, sql.operators.eq))
+
+# These operators don't depend on the request, so default filters using them
+# are safe to share across requests.
+STATIC_OPERATORS = EQUALITY_OPERATORS | frozenset((
+    operator.ne, operator.lt, operator.le, operator.gt, operator.ge,
+))
 
 # -----------------------------------------------------------------------------
 
@@ -20,6 +32,14 @@ class ArgFilterBase(object):
     def filter_query(self, query, view, arg_value):
         raise NotImplementedError()
 
+    def get_static_default_filter(self, view):
+        """Get the filter to use when the arg is missing, if it is static.
+
+        Return `None` if a missing arg does not filter the query, or
+        `UNDEFINED` if the filter depends on the request.
+        """
+        return UNDEFINED
+
 
 # -----------------------------------------------------------------------------
 
@@ -50,9 +70,8 @@ class FieldFilterBase(ArgFilterBase):
         if not self._separator or self._separator not in arg_value:
             return self.get_element_filter(view, arg_value)
 
-        return sa.or_(
-            self.get_element_filter(view, value_raw)
-            for value_raw in arg_value.split(self._separator)
+        return self.get_elements_filter(
+            view, arg_value.split(self._separator),
         )
 
     def get_default_filter(self, view):
@@ -66,22 +85,37 @@ class FieldFilterBase(ArgFilterBase):
 
         return self.get_element_filter(view, value)
 
+    def get_elements_filter(self, view, values_raw):
+        return sa.or_(
+            self.get_element_filter(view, value_raw)
+            for value_raw in values_raw
+        )
+
     def get_element_filter(self, view, value):
+        value = self.deserialize_element(view, value)
+        if value is UNDEFINED:
+            return sql.false()
+
+        return self.get_filter_clause(view, value)
+
+    def deserialize_element(self, view, value_raw):
+        """Deserialize an element of the arg value.
+
+        This returns `UNDEFINED` for invalid values when skipping those.
+        """
         field = self.get_field(view)
 
         try:
-            value = self.deserialize(field, value)
+            return self.deserialize(field, value_raw)
         except ValidationError as e:
             if self._skip_invalid:
-                return sql.false()
+                return UNDEFINED
 
             raise ApiError(400, *(
                 self.format_validation_error(message)
                 for message, path in iter_validation_errors(e.messages)
             ))
 
-        return self.get_filter_clause(view, value)
-
     def deserialize(self, field, value_raw):
         return field.deserialize(value_raw)
 
@@ -99,6 +133,9 @@ class FieldFilterBase(ArgFilterBase):
 
 
 class ColumnFilter(FieldFilterBase):
+    #: The maximum number of prepared filter fields to keep.
+    max_fields = 128
+
     def __init__(
         self,
         column_name=None,
@@ -122,7 +159,8 @@ class ColumnFilter(FieldFilterBase):
 
         self._operator = operator
 
-        self._fields = {}
+        self._fields = collections.OrderedDict()
+        self._fields_lock = threading.Lock()
         self._required = required
         self._missing = missing
 
@@ -141,18 +179,35 @@ class ColumnFilter(FieldFilterBase):
         self._column_name = arg_name
 
     def get_field(self, view):
-        base_field = view.deserializer.fields[self._column_name]
+        deserializer = view.deserializer
+        base_field = deserializer.fields[self._column_name]
 
-        try:
-            field = self._fields[base_field]
-        except KeyError:
-            # We don't want the default value handling on the original field,
-            # as that's only relevant for object deserialization.
-            field = copy.deepcopy(base_field)
-            field.required = self._required
-            field.missing = self._missing
+        # Key by schema class rather than by field, so schemas instantiated
+        # per request reuse a single entry instead of accumulating them.
+        key = (type(deserializer), self._column_name)
 
-            self._fields[base_field] = field
+        with self._fields_lock:
+            cached_base_field, field = self._fields.get(key, (None, None))
+            if cached_base_field is base_field:
+                return field
+
+        field = self.make_field(base_field)
+
+        with self._fields_lock:
+            self._fields[key] = (base_field, field)
+            while len(self._fields) > self.max_fields:
+                self._fields.popitem(last=False)
+
+        return field
+
+    def make_field(self, base_field):
+        # We don't want the default value handling on the original field,
+        # as that's only relevant for object deserialization. Only these
+        # attributes differ, so a shallow copy suffices, and keeps the field
+        # bound to the same schema and context as the original.
+        field = copy.copy(base_field)
+        field.required = self._required
+        field.missing = self._missing
 
         return field
 
@@ -160,6 +215,48 @@ class ColumnFilter(FieldFilterBase):
         column = getattr(view.model, self._column_name)
         return self._operator(column, value)
 
+    def get_static_default_filter(self, view):
+        # Custom operators may read the request, so only the default filters
+        # for built-in operators are static.
+        if self._operator not in STATIC_OPERATORS:
+            return UNDEFINED
+
+        field = self.get_field(view)
+        if field.required or callable(field.missing):
+            return UNDEFINED
+
+        return self.get_default_filter(view)
+
+    def get_elements_filter(self, view, values_raw):
+        if self._operator not in EQUALITY_OPERATORS:
+            return super(ColumnFilter, self).get_elements_filter(
+                view, values_raw,
+            )
+
+        # A single IN is much cheaper to compile and to plan than an OR of
+        # equality comparisons. Invalid values match nothing, so skipping them
+        # here is equivalent to the OR of their false filters.
+        values = []
+        for value_raw in values_raw:
+            value = self.deserialize_element(view, value_raw)
+            if value is not UNDEFINED:
+                values.append(value)
+
+        if not values:
+            return sql.false()
+
+        column = getattr(view.model, self._column_name)
+
+        # An expanding parameter keeps the SQL the same for any number of
+        # values.
+        return column.in_(sa.bindparam(
+            self._column_name,
+            values,
+            type_=column.type,
+            expanding=True,
+            unique=True,
+        ))
+
     def deserialize(self, field, value_raw):
         if not self._validate:
             # We may not want to apply the same validation for filters as we do
@@ -184,6 +281,140 @@ class ModelFilter(FieldFilterBase):
         return self._filter(view.model, value)
 
 
+class ColumnRangeFilter(ColumnFilter):
+    """Filter on a column being between two separated values, inclusive."""
+
+    def __init__(self, column_name=None, **kwargs):
+        super(ColumnRangeFilter, self).__init__(
+            column_name, self.filter_range, **kwargs
+        )
+
+    def get_filter(self, view, arg_value):
+        if arg_value is None:
+            return self.get_default_filter(view)
+
+        values_raw = arg_value.split(self._separator)
+        if len(values_raw) != 2:
+            raise ApiError(400, {'code': 'invalid_filter.range'})
+
+        bounds = tuple(
+            self.deserialize_element(view, value_raw)
+            for value_raw in values_raw
+        )
+        if any(bound is UNDEFINED for bound in bounds):
+            return sql.false()
+
+        return self.get_filter_clause(view, bounds)
+
+    def filter_range(self, column, bounds):
+        return column.between(*bounds)
+
+
+# -----------------------------------------------------------------------------
+
+
+def filter_prefix(column, value):
+    if not isinstance(value, basestring):
+        raise ApiError(400, {'code': 'invalid_filter.prefix'})
+
+    # Unlike a LIKE with a leading wildcard, this can use an index.
+    pattern = (
+        value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+    return column.like(pattern + '%', escape='\\')
+
+
+class OperatorFilters(object):
+    """Filters for a column with operator-suffixed arg names.
+
+    For example, ``Filtering(price=OperatorFilters())`` handles args such as
+    ``price[gte]=10&price[lt]=20``. The ``eq`` operator uses the plain arg
+    name.
+
+    The supported operators are ``eq``, ``ne``, ``gt``, ``gte``, ``lt``,
+    ``lte``, ``in`` for separated values, ``range`` for two separated values,
+    ``prefix`` for strings starting with the value, and ``isnull``. All but
+    ``prefix`` are allowed by default, as it only applies to string fields.
+
+    :param str column_name: The column to filter on. Defaults to the arg name.
+    :param operators: The names of the operators to allow.
+    :param kwargs: Additional arguments for each `ColumnFilter`.
+    """
+
+    arg_name_format = '{}[{}]'
+
+    comparison_operators = {
+        'eq': operator.eq,
+        'ne': operator.ne,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'lt': operator.lt,
+        'lte': operator.le,
+        'prefix': filter_prefix,
+    }
+
+    default_operators = (
+        'eq', 'ne', 'gt', 'gte', 'lt', 'lte', 'in', 'range', 'isnull',
+    )
+
+    def __init__(self, column_name=None, operators=None, **kwargs):
+        self._column_name = column_name
+        self._operators = (
+            operators if operators is not None else self.default_operators
+        )
+        self._kwargs = kwargs
+
+        for operator_name in self._operators:
+            if (
+                operator_name not in self.comparison_operators and
+                operator_name not in ('in', 'range', 'isnull')
+            ):
+                raise TypeError(
+                    "unknown filter operator {!r}".format(operator_name),
+                )
+
+    def make_arg_filters(self, arg_name):
+        column_name = self._column_name or arg_name
+
+        return tuple(
+            (
+                self.get_arg_name(arg_name, operator_name),
+                self.make_operator_filter(column_name, operator_name),
+            )
+            for operator_name in self._operators
+        )
+
+    def get_arg_name(self, arg_name, operator_name):
+        if operator_name == 'eq':
+            return arg_name
+
+        return self.arg_name_format.format(arg_name, operator_name)
+
+    def make_operator_filter(self, column_name, operator_name):
+        if operator_name == 'isnull':
+            return ModelFilter(
+                fields.Boolean(),
+                lambda model, value: self.filter_isnull(
+                    getattr(model, column_name), value,
+                ),
+                separator=None,
+            )
+
+        if operator_name == 'in':
+            return ColumnFilter(column_name, operator.eq, **self._kwargs)
+
+        if operator_name == 'range':
+            return ColumnRangeFilter(column_name, **self._kwargs)
+
+        kwargs = dict({'separator': None}, **self._kwargs)
+        return ColumnFilter(
+            column_name, self.comparison_operators[operator_name], **kwargs
+        )
+
+    def filter_isnull(self, column, value):
+        return column.is_(None) if value else column.isnot(None)
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -201,11 +432,20 @@ def model_filter(field, **kwargs):
 
 class Filtering(object):
     def __init__(self, **kwargs):
-        self._arg_filters = {
-            arg_name: self.make_arg_filter(arg_name, arg_filter)
-            for arg_name, arg_filter in kwargs.items()
+        self._arg_filters = collections.OrderedDict()
+        for arg_name, arg_filter in sorted(kwargs.items()):
+            if isinstance(arg_filter, OperatorFilters):
+                self._arg_filters.update(arg_filter.make_arg_filters(arg_name))
+            else:
+                self._arg_filters[arg_name] = self.make_arg_filter(
+                    arg_name, arg_filter,
+                )
+        self._arg_indices = {
+            arg_name: i for i, arg_name in enumerate(self._arg_filters)
         }
 
+        self._default_filters = {}
+
     def make_arg_filter(self, arg_name, arg_filter):
         if callable(arg_filter):
             arg_filter = ColumnFilter(arg_name, arg_filter)
@@ -217,18 +457,71 @@ class Filtering(object):
     def filter_query(self, query, view):
         args = flask.request.args
 
-        for arg_name, arg_filter in self._arg_filters.items():
-            try:
-                arg_value = args[arg_name]
-            except KeyError:
-                arg_value = None
+        # Apply filters in a fixed order, so the same args always produce the
+        # same SQL.
+        request_arg_names = sorted(
+            (arg_name for arg_name in args if arg_name in self._arg_filters),
+            key=self._arg_indices.__getitem__,
+        )
+        for arg_name in request_arg_names:
+            query = self.filter_query_by_arg(
+                query, view, arg_name, args[arg_name],
+            )
+
+        for arg_name, default_filter in self.get_default_filters(view):
+            if arg_name in args:
+                continue
+
+            if default_filter is UNDEFINED:
+                query = self.filter_query_by_arg(query, view, arg_name, None)
+            else:
+                query = query.filter(default_filter)
+
+        return query
+
+    def filter_query_by_arg(self, query, view, arg_name, arg_value):
+        arg_filter = self._arg_filters[arg_name]
 
+        try:
+            return arg_filter.filter_query(query, view, arg_value)
+        except ApiError as e:
+            raise e.update({'source': {'parameter': arg_name}})
+
+    def get_default_filters(self, view):
+        """Get the filters for missing args, for the view.
+
+        These are resolved once per view class and deserializer. Missing args
+        that don't filter the query are left out, so requests only need to
+        handle the args they actually have.
+        """
+        deserializer = view.deserializer
+
+        try:
+            cached_deserializer, default_filters = (
+                self._default_filters[type(view)]
+            )
+        except KeyError:
+            pass
+        else:
+            if cached_deserializer is deserializer:
+                return default_filters
+
+        default_filters = []
+        for arg_name, arg_filter in self._arg_filters.items():
             try:
-                query = arg_filter.filter_query(query, view, arg_value)
+                default_filter = arg_filter.get_static_default_filter(view)
             except ApiError as e:
                 raise e.update({'source': {'parameter': arg_name}})
 
-        return query
+            if default_filter is not None:
+                default_filters.append((arg_name, default_filter))
+
+        default_filters = tuple(default_filters)
+        self._default_filters[type(view)] = (deserializer, default_filters)
+        return default_filters
+
+    def get_arg_names(self):
+        return tuple(self._arg_filters)
 
     def spec_declaration(self, path, spec, **kwargs):
         for arg_name in self._arg_filters:
@@ -0,0 +1,208 @@
+import collections
+import threading
+
+import flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import context, meta
+from .compat import perf_counter
+
+# -----------------------------------------------------------------------------
+
+START_TIMES_KEY = 'flask_resty_start_times'
+
+_engine_listeners_lock = threading.Lock()
+_engine_listeners_installed = False
+
+# -----------------------------------------------------------------------------
+
+
+class RequestMetrics(object):
+    """Statement counts and timings for a single request.
+
+    Times are in seconds.
+    """
+
+    def __init__(self):
+        self.statement_count = 0
+        self.statement_time = 0
+        self.phase_times = collections.OrderedDict()
+
+    def add_statement(self, duration):
+        self.statement_count += 1
+        self.statement_time += duration
+
+    def add_phase(self, name, duration):
+        self.phase_times[name] = self.phase_times.get(name, 0) + duration
+
+    def phase(self, name):
+        return Phase(self, name)
+
+    def to_dict(self):
+        """Render the metrics, with times in milliseconds."""
+        return {
+            'statement_count': self.statement_count,
+            'statement_time': to_milliseconds(self.statement_time),
+            'phase_times': collections.OrderedDict(
+                (name, to_milliseconds(duration))
+                for name, duration in self.phase_times.items()
+            ),
+        }
+
+
+class Phase(object):
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._start_time = None
+
+    def __enter__(self):
+        self._start_time = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics.add_phase(self._name, perf_counter() - self._start_time)
+
+
+class NoOpPhase(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NO_OP_PHASE = NoOpPhase()
+
+# -----------------------------------------------------------------------------
+
+
+def get_request_metrics():
+    if not flask.has_request_context():
+        return None
+
+    return context.get('request_metrics')
+
+
+def measure_phase(name):
+    """Measure the time spent in a phase of the current request.
+
+    This does nothing unless the request is instrumented.
+    """
+    metrics = get_request_metrics()
+    if metrics is None:
+        return NO_OP_PHASE
+
+    return metrics.phase(name)
+
+
+def to_milliseconds(duration):
+    return round(duration * 1000, 3)
+
+
+# -----------------------------------------------------------------------------
+
+
+def install_engine_listeners():
+    """Count and time statements from all engines for instrumented requests.
+
+    The listeners are only installed once, and do nothing outside of
+    instrumented requests.
+    """
+    global _engine_listeners_installed
+
+    with _engine_listeners_lock:
+        if _engine_listeners_installed:
+            return
+
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+        _engine_listeners_installed = True
+
+
+def before_cursor_execute(conn, cursor, statement, *args):
+    if get_request_metrics() is None:
+        return
+
+    conn.info.setdefault(START_TIMES_KEY, []).append(perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, *args):
+    start_times = conn.info.get(START_TIMES_KEY)
+    if not start_times:
+        return
+
+    duration = perf_counter() - start_times.pop()
+
+    metrics = get_request_metrics()
+    if metrics is not None:
+        metrics.add_statement(duration)
+
+
+# -----------------------------------------------------------------------------
+
+
+class Instrumentation(object):
+    """Record statement counts and phase timings for a view's requests.
+
+    The metrics are available from `get_request_metrics` while handling the
+    request.
+
+    :param bool meta: Whether to add the metrics to the response meta.
+    :param bool server_timing: Whether to add a ``Server-Timing`` header to
+        the response.
+    :param callback: A function to call with the view and the metrics after
+        each request, such as to export them to a metrics system.
+    """
+
+    meta_key = 'metrics'
+
+    def __init__(self, meta=False, server_timing=False, callback=None):
+        self._meta = meta
+        self._server_timing = server_timing
+        self._callback = callback
+
+        install_engine_listeners()
+
+    def instrument_request(self, view, dispatch, *args, **kwargs):
+        metrics = RequestMetrics()
+        context.set('request_metrics', metrics)
+
+        try:
+            response = dispatch(*args, **kwargs)
+        except Exception:
+            self.finish_request(view, metrics)
+            raise
+
+        if self._server_timing:
+            response = flask.make_response(response)
+            response.headers['Server-Timing'] = (
+                self.format_server_timing(metrics)
+            )
+
+        self.finish_request(view, metrics)
+        return response
+
+    def finish_request(self, view, metrics):
+        if self._callback is not None:
+            self._callback(view, metrics)
+
+    def update_response_meta(self):
+        if not self._meta:
+            return
+
+        metrics = get_request_metrics()
+        if metrics is not None:
+            meta.update_response_meta({self.meta_key: metrics.to_dict()})
+
+    def format_server_timing(self, metrics):
+        entries = ['db;dur={};desc="{} statements"'.format(
+            to_milliseconds(metrics.statement_time), metrics.statement_count,
+        )]
+        entries.extend(
+            '{};dur={}'.format(name, to_milliseconds(duration))
+            for name, duration in metrics.phase_times.items()
+        )
+
+        return ', '.join(entries)
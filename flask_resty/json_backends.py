@@ -0,0 +1,116 @@
+import flask
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# -----------------------------------------------------------------------------
+
+
+class JsonBackendBase(object):
+    def dumps(self, obj):
+        raise NotImplementedError()
+
+    def loads(self, s):
+        raise NotImplementedError()
+
+    def jsonify(self, obj):
+        app = flask.current_app
+        return app.response_class(
+            self.dumps(obj), mimetype=app.config['JSONIFY_MIMETYPE'],
+        )
+
+    def get_request_json(self, request):
+        if not request.is_json:
+            return None
+
+        try:
+            return self.loads(request.get_data(cache=True))
+        except ValueError as e:
+            return request.on_json_loading_failed(e)
+
+
+class StdlibJsonBackend(JsonBackendBase):
+    """Use Flask's JSON handling, including the app's JSON encoder."""
+
+    def dumps(self, obj):
+        return flask.json.dumps(obj)
+
+    def loads(self, s):
+        return flask.json.loads(s)
+
+    def jsonify(self, obj):
+        return flask.jsonify(obj)
+
+    def get_request_json(self, request):
+        return request.get_json()
+
+
+class OrjsonJsonBackend(JsonBackendBase):
+    """Use orjson, falling back to the app's JSON encoder for other types.
+
+    Dates and times are passed through to the app's JSON encoder, so they are
+    rendered the same way as with `StdlibJsonBackend`.
+    """
+
+    def dumps(self, obj):
+        app = flask.current_app
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if app.config['JSON_SORT_KEYS']:
+            option |= orjson.OPT_SORT_KEYS
+
+        return orjson.dumps(
+            obj, default=app.json_encoder().default, option=option,
+        ).decode()
+
+    def loads(self, s):
+        return orjson.loads(s)
+
+
+# -----------------------------------------------------------------------------
+
+_json_backends = {}
+
+
+def register_json_backend(name, backend):
+    _json_backends[name] = backend
+
+
+register_json_backend('stdlib', StdlibJsonBackend())
+
+if orjson is not None:
+    register_json_backend('orjson', OrjsonJsonBackend())
+
+# -----------------------------------------------------------------------------
+
+
+def get_json_backend(app=None):
+    """Get the JSON backend configured by ``RESTY_JSON_BACKEND``.
+
+    The config value can be either the name of a registered backend or a
+    backend instance.
+    """
+    app = app or flask.current_app
+    backend = app.config.get('RESTY_JSON_BACKEND', 'stdlib')
+    if not isinstance(backend, JsonBackendBase):
+        backend = _json_backends[backend]
+
+    return backend
+
+
+def dumps(obj):
+    return get_json_backend().dumps(obj)
+
+
+def loads(s):
+    return get_json_backend().loads(s)
+
+
+def jsonify(obj):
+    return get_json_backend().jsonify(obj)
+
+
+def get_request_json():
+    return get_json_backend().get_request_json(flask.request)
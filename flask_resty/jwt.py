@@ -1,7 +1,15 @@
 from __future__ import absolute_import
 
 import base64
+import collections
+import datetime
+import hashlib
 import json
+import logging
+import threading
+import time
+import uuid
+import weakref
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.x509 import load_der_x509_certificate
@@ -11,6 +19,7 @@ from jwt.algorithms import get_default_algorithms
 from jwt.exceptions import InvalidAlgorithmError, InvalidTokenError
 
 from .authentication import AuthenticationBase
+from .compat import urlopen
 from .exceptions import ApiError
 
 
@@ -26,6 +35,10 @@ JWT_DECODE_ARG_KEYS = (
     'leeway',
 )
 
+EMPTY_JWK_SET = {'keys': ()}
+
+logger = logging.getLogger(__name__)
+
 # -----------------------------------------------------------------------------
 
 
@@ -35,25 +48,72 @@ class JwtAuthentication(AuthenticationBase):
     header_scheme = 'Bearer'
     id_token_arg = 'id_token'
 
-    def __init__(self, **kwargs):
+    def __init__(self, token_cache=None, **kwargs):
         super(JwtAuthentication, self).__init__()
 
         self._decode_args = {
             key: kwargs[key] for key in JWT_DECODE_ARG_KEYS if key in kwargs
         }
 
+        self.token_cache = token_cache
+
+        self._app_decode_args = weakref.WeakKeyDictionary()
+        self._app_token_cache_scopes = weakref.WeakKeyDictionary()
+
     def get_request_credentials(self):
         token = self.get_token()
         if not token:
             return None
 
         try:
-            payload = self.decode_token(token)
+            payload = self.get_token_payload(token)
         except InvalidTokenError:
             raise ApiError(401, {'code': 'invalid_token'})
 
         return self.get_credentials(payload)
 
+    def get_token_payload(self, token):
+        if self.token_cache is None:
+            return self.decode_token(token)
+
+        scope = self.get_token_cache_scope()
+
+        payload = self.token_cache.get(token, scope)
+        if payload is not None:
+            return payload
+
+        payload = self.decode_token(token)
+        self.token_cache.set(
+            token, payload, self.get_token_expires_at(payload), scope,
+        )
+        return payload
+
+    def get_token_cache_scope(self):
+        """Get the scope of cached tokens for the current app.
+
+        A token is only verified for the app and the decode arguments used to
+        decode it, so each app gets its own scope for each authentication.
+        """
+        app = flask.current_app._get_current_object()
+
+        try:
+            return self._app_token_cache_scopes[app]
+        except KeyError:
+            scope = uuid.uuid4().hex
+            self._app_token_cache_scopes[app] = scope
+            return scope
+
+    def get_token_expires_at(self, payload):
+        """Get the time after which a decoded token is no longer valid."""
+        if 'exp' not in payload:
+            return None
+
+        leeway = self.get_jwt_decode_args().get('leeway', 0)
+        if isinstance(leeway, datetime.timedelta):
+            leeway = leeway.total_seconds()
+
+        return payload['exp'] + leeway
+
     def get_token(self):
         authorization = flask.request.headers.get('Authorization')
         if authorization:
@@ -81,7 +141,22 @@ class JwtAuthentication(AuthenticationBase):
         return jwt.decode(token, **self.get_jwt_decode_args())
 
     def get_jwt_decode_args(self):
-        config = flask.current_app.config
+        """Get the arguments for decoding tokens for the current app.
+
+        These are resolved from the app config on first use, then reused for
+        later requests. Call `reset_jwt_decode_args` after changing the
+        relevant config. The returned dict is shared and must not be modified.
+        """
+        app = flask.current_app._get_current_object()
+
+        try:
+            return self._app_decode_args[app]
+        except KeyError:
+            args = self.resolve_jwt_decode_args(app.config)
+            self._app_decode_args[app] = args
+            return args
+
+    def resolve_jwt_decode_args(self, config):
         args = {
             key: config[self.get_config_key(key)]
             for key in JWT_DECODE_ARG_KEYS
@@ -91,6 +166,24 @@ class JwtAuthentication(AuthenticationBase):
         args.update(self._decode_args)
         return args
 
+    def reset_jwt_decode_args(self, app=None):
+        """Discard the resolved decode arguments.
+
+        This also clears the token cache, as cached tokens were verified with
+        the old arguments.
+
+        :param app: If specified, only discard the arguments for this app.
+        """
+        if app is None:
+            self._app_decode_args.clear()
+            self._app_token_cache_scopes.clear()
+        else:
+            self._app_decode_args.pop(app, None)
+            self._app_token_cache_scopes.pop(app, None)
+
+        if self.token_cache is not None:
+            self.token_cache.clear()
+
     def get_config_key(self, key):
         return self.CONFIG_KEY_TEMPLATE.format(key.upper())
 
@@ -98,6 +191,78 @@ class JwtAuthentication(AuthenticationBase):
         return payload
 
 
+class TokenCache(object):
+    """A bounded LRU cache of decoded token payloads.
+
+    Entries expire after `ttl` seconds, or when the token itself expires,
+    whichever is sooner. Tokens are stored by digest rather than as-is, along
+    with an optional scope, such that tokens verified in one scope aren't
+    accepted in another.
+
+    :param int max_size: The maximum number of tokens to cache.
+    :param ttl: The maximum number of seconds to cache a token.
+    """
+
+    def __init__(self, max_size=1024, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(self, token, scope=None):
+        if not isinstance(token, bytes):
+            token = token.encode('utf-8')
+
+        if scope is not None:
+            token = scope.encode('utf-8') + b'\0' + token
+
+        return hashlib.sha256(token).digest()
+
+    def get(self, token, scope=None):
+        key = self.get_key(token, scope)
+        now = time.time()
+
+        with self._lock:
+            try:
+                payload, expires_at = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+
+            if now >= expires_at:
+                self.misses += 1
+                return None
+
+            # Reinsert the entry to mark it as most recently used.
+            self._entries[key] = (payload, expires_at)
+            self.hits += 1
+
+        # Callers may modify the payload, so don't share the cached one.
+        return dict(payload)
+
+    def set(self, token, payload, token_expires_at=None, scope=None):
+        key = self.get_key(token, scope)
+
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (dict(payload), expires_at)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class JwkSetAuthentication(JwtAuthentication):
     def __init__(self, jwk_set=None, **kwargs):
         super(JwkSetAuthentication, self).__init__(**kwargs)
@@ -105,13 +270,49 @@ class JwkSetAuthentication(JwtAuthentication):
         self.jwk_set = jwk_set
         self.algorithms = get_default_algorithms()
 
+        self._jwk_set_cache = JwkSetCache(None)
+        self._jwk_set_cache_lock = threading.Lock()
+
     def get_jwk_set(self):
+        jwk_set = self.get_configured_jwk_set()
+        if isinstance(jwk_set, JwkSetProviderBase):
+            return jwk_set.get_jwk_set()
+
+        return jwk_set
+
+    def get_configured_jwk_set(self):
+        """Get the configured JWK set, which may be a JWK set provider."""
         config = flask.current_app.config
         return (
             self.jwk_set if self.jwk_set
             else config[self.get_config_key('jwk_set')]
         )
 
+    def handle_unknown_kid(self, kid):
+        # The keys may have been rotated. This doesn't wait for the refresh,
+        # so this token is still rejected, but later ones may succeed.
+        jwk_set = self.get_configured_jwk_set()
+        if isinstance(jwk_set, JwkSetProviderBase):
+            jwk_set.request_refresh()
+
+    def get_jwk_set_cache(self):
+        """Get the cache of JWKs and parsed keys for the current JWK set.
+
+        The cache is replaced whenever a different JWK set object is
+        configured. Replace the JWK set rather than modifying it in place.
+        """
+        jwk_set = self.get_jwk_set()
+
+        jwk_set_cache = self._jwk_set_cache
+        if jwk_set_cache.jwk_set is not jwk_set:
+            with self._jwk_set_cache_lock:
+                jwk_set_cache = self._jwk_set_cache
+                if jwk_set_cache.jwk_set is not jwk_set:
+                    jwk_set_cache = JwkSetCache(jwk_set)
+                    self._jwk_set_cache = jwk_set_cache
+
+        return jwk_set_cache
+
     def get_key_from_jwk(self, jwk, algorithm):
         if 'x5c' in jwk:
             return load_der_x509_certificate(
@@ -124,23 +325,28 @@ class JwkSetAuthentication(JwtAuthentication):
 
     def get_jwk_for_token(self, token):
         unverified_header = jwt.get_unverified_header(token)
+        return self.get_jwk_for_header(
+            self.get_jwk_set_cache(), unverified_header,
+        )
 
+    def get_jwk_for_header(self, jwk_set_cache, unverified_header):
         try:
             token_kid = unverified_header['kid']
         except KeyError:
             raise InvalidTokenError("Key ID header parameter is missing")
 
-        for jwk in self.get_jwk_set()['keys']:
-            if jwk['kid'] == token_kid:
-                return jwk
-
-        raise InvalidTokenError("no key found")
+        try:
+            return jwk_set_cache.jwks[token_kid]
+        except KeyError:
+            self.handle_unknown_kid(token_kid)
+            raise InvalidTokenError("no key found")
 
     def decode_token(self, token):
         args = self.get_jwt_decode_args()
 
         unverified_header = jwt.get_unverified_header(token)
-        jwk = self.get_jwk_for_token(token)
+        jwk_set_cache = self.get_jwk_set_cache()
+        jwk = self.get_jwk_for_header(jwk_set_cache, unverified_header)
 
         # It's safe to use alg from the header here, as we verify that against
         # the algorithm whitelist.
@@ -153,7 +359,165 @@ class JwkSetAuthentication(JwtAuthentication):
             )
 
         return jwt.decode(
-            token,
-            key=self.get_key_from_jwk(jwk, self.algorithms[alg]),
-            **args
+            token, key=self.get_key(jwk_set_cache, jwk, alg), **args
+        )
+
+    def get_key(self, jwk_set_cache, jwk, alg):
+        # Parsing keys is expensive, so only do it once per JWK set.
+        key_id = (jwk['kid'], alg)
+
+        try:
+            return jwk_set_cache.keys[key_id]
+        except KeyError:
+            pass
+
+        with jwk_set_cache.lock:
+            try:
+                return jwk_set_cache.keys[key_id]
+            except KeyError:
+                key = self.get_key_from_jwk(jwk, self.algorithms[alg])
+                jwk_set_cache.keys[key_id] = key
+                return key
+
+
+class JwkSetCache(object):
+    """JWKs indexed by key ID, with their parsed keys, for one JWK set."""
+
+    def __init__(self, jwk_set):
+        self.jwk_set = jwk_set
+
+        self.jwks = {}
+        if jwk_set is not None:
+            for jwk in jwk_set['keys']:
+                # Match the first JWK with a given key ID.
+                self.jwks.setdefault(jwk['kid'], jwk)
+
+        self.keys = {}
+        self.lock = threading.Lock()
+
+
+# -----------------------------------------------------------------------------
+
+
+class JwkSetProviderBase(object):
+    def get_jwk_set(self):
+        raise NotImplementedError()
+
+    def request_refresh(self):
+        pass
+
+
+class RemoteJwkSetProvider(JwkSetProviderBase):
+    """Provide a JWK set fetched from a URL on a background thread.
+
+    Request threads never wait on the network. They get the last fetched JWK
+    set, which is kept if a refresh fails. Until the first fetch completes,
+    this provides an empty JWK set; call `refresh` directly at startup to
+    fetch the JWK set up front.
+
+    :param str url: The URL of the JWK set.
+    :param refresh_interval: The number of seconds between refreshes.
+    :param min_refresh_interval: The minimum number of seconds between
+        refreshes, including those requested for unknown key IDs.
+    :param timeout: The timeout in seconds for fetching the JWK set.
+    """
+
+    def __init__(
+        self,
+        url,
+        refresh_interval=3600,
+        min_refresh_interval=60,
+        timeout=10,
+    ):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+
+        self._jwk_set = EMPTY_JWK_SET
+        self._last_refresh_at = None
+
+        self._lock = threading.Lock()
+        self._refresh_event = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def get_jwk_set(self):
+        self.start()
+        return self._jwk_set
+
+    def request_refresh(self):
+        with self._lock:
+            if self._is_refresh_limited():
+                return
+
+        self._refresh_event.set()
+
+    def start(self):
+        if self._thread is not None or self._stopped:
+            return
+
+        with self._lock:
+            if self._thread is not None or self._stopped:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name='RemoteJwkSetProvider',
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread = self._thread
+            self._stopped = True
+
+        self._refresh_event.set()
+        if thread is not None:
+            thread.join()
+
+    def refresh(self):
+        """Fetch the JWK set now, keeping the current one on failure."""
+        with self._lock:
+            self._last_refresh_at = time.time()
+
+        try:
+            jwk_set = self.fetch_jwk_set()
+        except Exception:
+            logger.exception("failed to fetch JWK set from %s", self.url)
+            return False
+
+        self._jwk_set = jwk_set
+        return True
+
+    def fetch_jwk_set(self):
+        response = urlopen(self.url, timeout=self.timeout)
+        try:
+            jwk_set = json.loads(response.read().decode('utf-8'))
+        finally:
+            response.close()
+
+        if not isinstance(jwk_set, dict) or 'keys' not in jwk_set:
+            raise ValueError("invalid JWK set")
+
+        return jwk_set
+
+    def _is_refresh_limited(self):
+        return (
+            self._last_refresh_at is not None and
+            time.time() - self._last_refresh_at < self.min_refresh_interval
         )
+
+    def _run(self):
+        # Skip the initial fetch if the JWK set was already fetched directly.
+        if self._last_refresh_at is None:
+            self.refresh()
+
+        while True:
+            self._refresh_event.wait(self.refresh_interval)
+            self._refresh_event.clear()
+
+            if self._stopped:
+                return
+
+            self.refresh()
@@ -0,0 +1,149 @@
+import collections
+import threading
+
+from marshmallow import fields
+import sqlalchemy as sa
+from sqlalchemy.orm import Load
+
+from .utils import UNDEFINED
+
+# -----------------------------------------------------------------------------
+
+
+class LoadPlanner(object):
+    """Plan query options to load the fields dumped by a view's serializer.
+
+    Relationships dumped with `Nested` fields, including `RelatedItem` fields
+    and lists of those, are eagerly loaded. By default, collections use
+    ``selectinload``, which takes one query per relationship regardless of
+    the number of items, while scalar relationships use ``joinedload``.
+
+    Plans are resolved once per model and serializer fields, and the most
+    recently used plans are kept, as sparse fieldsets let clients pick the
+    fields.
+
+    :param dict strategies: Loader strategies by dotted relationship path, such
+        as ``{'children.parent': 'subquery'}``. Use `None` to skip eager
+        loading a relationship.
+    :param bool load_only: Whether to only load the columns dumped by the
+        serializer. This only applies to schemas where every field maps to a
+        column or to an eagerly loaded relationship.
+    :param int max_size: The maximum number of plans to keep.
+    """
+
+    def __init__(self, strategies=None, load_only=False, max_size=128):
+        self._strategies = strategies or {}
+        self._load_only = load_only
+        self._max_size = max_size
+
+        self._query_options = collections.OrderedDict()
+        self._query_options_lock = threading.Lock()
+
+    def get_query_options(self, view):
+        serializer = view.serializer
+        key = (view.model, type(serializer), tuple(serializer.fields))
+
+        with self._query_options_lock:
+            try:
+                query_options = self._query_options.pop(key)
+            except KeyError:
+                pass
+            else:
+                # Reinsert the plan to mark it as most recently used.
+                self._query_options[key] = query_options
+                return query_options
+
+        query_options = tuple(self.plan_query_options(
+            Load(view.model),
+            sa.inspect(view.model),
+            serializer,
+            (),
+            self.get_required_column_names(view),
+        ))
+
+        with self._query_options_lock:
+            self._query_options[key] = query_options
+            while len(self._query_options) > self._max_size:
+                self._query_options.popitem(last=False)
+
+        return query_options
+
+    def get_required_column_names(self, view):
+        column_names = set(view.id_fields)
+        if view.version_field:
+            column_names.add(view.version_field)
+
+        return column_names
+
+    def plan_query_options(
+        self, load, mapper, schema, path, required_column_names=(),
+    ):
+        query_options = []
+
+        column_names = set(required_column_names)
+        use_load_only = self._load_only
+
+        for field_name, field in schema.fields.items():
+            attribute = field.attribute or field_name
+
+            if attribute in mapper.relationships:
+                relationship = mapper.relationships[attribute]
+                nested_schema = self.get_nested_schema(field)
+                relationship_path = path + (attribute,)
+
+                loader = None
+                if nested_schema is not None:
+                    loader = self.get_loader(
+                        load, relationship, relationship_path,
+                    )
+
+                if loader is None:
+                    # Leave the relationship to load lazily, which may need
+                    # any of the columns.
+                    use_load_only = False
+                    continue
+
+                query_options.append(loader)
+                query_options.extend(self.plan_query_options(
+                    loader, relationship.mapper, nested_schema,
+                    relationship_path,
+                ))
+
+                column_names.update(
+                    mapper.get_property_by_column(column).key
+                    for column in relationship.local_columns
+                )
+            elif attribute in mapper.column_attrs:
+                column_names.add(attribute)
+            else:
+                # This field may read any attribute on the item.
+                use_load_only = False
+
+        if use_load_only:
+            query_options.append(load.load_only(*sorted(column_names)))
+
+        return query_options
+
+    def get_nested_schema(self, field):
+        if isinstance(field, fields.List):
+            field = field.container
+
+        if not isinstance(field, fields.Nested):
+            return None
+
+        return field.schema
+
+    def get_loader(self, load, relationship, path):
+        if relationship.lazy == 'dynamic':
+            return None
+
+        strategy = self._strategies.get('.'.join(path), UNDEFINED)
+        if strategy is UNDEFINED:
+            strategy = self.get_default_strategy(relationship)
+        if strategy is None:
+            return None
+
+        return getattr(load, '{}load'.format(strategy))(relationship.key)
+
+    def get_default_strategy(self, relationship):
+        return 'selectin' if relationship.uselist else 'joined'
@@ -18,6 +18,9 @@ class PaginationBase(object):
     def get_item_meta(self, item, view):
         return None
 
+    def get_arg_names(self):
+        return ()
+
 
 # -----------------------------------------------------------------------------
 
@@ -70,6 +73,9 @@ class LimitPagination(LimitPaginationBase):
         except ApiError as e:
             raise e.update({'source': {'parameter': self.limit_arg}})
 
+    def get_arg_names(self):
+        return (self.limit_arg,)
+
     def parse_limit(self, limit):
         if limit is None:
             return self._default_limit
@@ -104,10 +110,64 @@ class LimitPagination(LimitPaginationBase):
 class LimitOffsetPagination(LimitPagination):
     offset_arg = 'offset'
 
+    def __init__(
+        self,
+        default_limit=None,
+        max_limit=None,
+        count=False,
+        max_count=None,
+    ):
+        super(LimitOffsetPagination, self).__init__(default_limit, max_limit)
+
+        assert count or max_count is None, (
+            "max count requires count to be enabled"
+        )
+
+        self._count = count
+        self._max_count = max_count
+
     def get_page(self, query, view):
         offset = self.get_offset()
-        query = query.offset(offset)
-        return super(LimitOffsetPagination, self).get_page(query, view)
+
+        if not self._count:
+            query = query.offset(offset)
+            return super(LimitOffsetPagination, self).get_page(query, view)
+
+        if self._max_count is not None:
+            items = super(LimitOffsetPagination, self).get_page(
+                query.offset(offset), view,
+            )
+            self.update_capped_total_count(query)
+            return items
+
+        # Fetch the total count alongside the items in a single query.
+        count_query = query.add_columns(
+            sa.func.count().over().label('total_count'),
+        )
+        rows = super(LimitOffsetPagination, self).get_page(
+            count_query.offset(offset), view,
+        )
+
+        if rows:
+            total_count = rows[0].total_count
+        elif offset:
+            # There are no rows to carry the count when paging past the end.
+            total_count = query.order_by(None).count()
+        else:
+            total_count = 0
+
+        meta.update_response_meta({'total_count': total_count})
+        return [row[0] for row in rows]
+
+    def update_capped_total_count(self, query):
+        # Counting at most max_count + 1 rows bounds the cost of the count on
+        # large tables, while still telling whether the count was capped.
+        total_count = query.order_by(None).limit(self._max_count + 1).count()
+
+        meta.update_response_meta({
+            'total_count': min(total_count, self._max_count),
+            'total_count_capped': total_count > self._max_count,
+        })
 
     def get_offset(self):
         offset = flask.request.args.get(self.offset_arg)
@@ -116,6 +176,11 @@ class LimitOffsetPagination(LimitPagination):
         except ApiError as e:
             raise e.update({'source': {'parameter': self.offset_arg}})
 
+    def get_arg_names(self):
+        return super(LimitOffsetPagination, self).get_arg_names() + (
+            self.offset_arg,
+        )
+
     def parse_offset(self, offset):
         if offset is None:
             return 0
@@ -142,8 +207,10 @@ class LimitOffsetPagination(LimitPagination):
 class PagePagination(LimitOffsetPagination):
     page_arg = 'page'
 
-    def __init__(self, page_size):
-        super(PagePagination, self).__init__()
+    def __init__(self, page_size, count=False, max_count=None):
+        super(PagePagination, self).__init__(
+            count=count, max_count=max_count,
+        )
         self._page_size = page_size
 
     def get_offset(self):
@@ -156,6 +223,10 @@ class PagePagination(LimitOffsetPagination):
         except ApiError as e:
             raise e.update({'source': {'parameter': self.page_arg}})
 
+    def get_arg_names(self):
+        # The page size is fixed, so the limit and offset args are unused.
+        return (self.page_arg,)
+
     def parse_page(self, page):
         if page is None:
             return 0
@@ -188,6 +259,18 @@ class PagePagination(LimitOffsetPagination):
 class CursorPaginationBase(LimitPagination):
     cursor_arg = 'cursor'
 
+    def __init__(
+        self,
+        default_limit=None,
+        max_limit=None,
+        use_row_values=False,
+    ):
+        super(CursorPaginationBase, self).__init__(default_limit, max_limit)
+
+        # Row value comparisons let the planner use a single index range scan,
+        # but not all backends support them.
+        self._use_row_values = use_row_values
+
     def ensure_query_sorting(self, query, view):
         sorting_field_orderings, missing_field_orderings = (
             self.get_sorting_and_missing_field_orderings(view)
@@ -245,6 +328,11 @@ class CursorPaginationBase(LimitPagination):
         except ApiError as e:
             raise e.update({'source': {'parameter': self.cursor_arg}})
 
+    def get_arg_names(self):
+        return super(CursorPaginationBase, self).get_arg_names() + (
+            self.cursor_arg,
+        )
+
     def parse_cursor(self, cursor, view, field_orderings):
         cursor = self.decode_cursor(cursor)
 
@@ -299,6 +387,9 @@ class CursorPaginationBase(LimitPagination):
             for (field_name, asc), value in zip(field_orderings, cursor)
         )
 
+        if self._use_row_values:
+            return self.get_row_value_filter(column_cursors)
+
         return sa.or_(
             self.get_filter_clause(column_cursors[:i + 1])
             for i in range(len(column_cursors))
@@ -317,6 +408,46 @@ class CursorPaginationBase(LimitPagination):
 
         return sa.and_(previous_clauses, current_clause)
 
+    def get_row_value_filter(self, column_cursors):
+        asc = column_cursors[0][1]
+        num_leading = 1
+        while (
+            num_leading < len(column_cursors) and
+            column_cursors[num_leading][1] == asc
+        ):
+            num_leading += 1
+
+        leading_column_cursors = column_cursors[:num_leading]
+        trailing_column_cursors = column_cursors[num_leading:]
+
+        columns = sa.tuple_(*(
+            column for column, _, _ in leading_column_cursors
+        ))
+        values = sa.tuple_(*(
+            value for _, _, value in leading_column_cursors
+        ))
+
+        if not trailing_column_cursors:
+            return columns > values if asc else columns < values
+
+        # With mixed directions, there is no single row value comparison.
+        # Bound the leading columns with an inclusive row value comparison so
+        # the planner can still use an index range scan, then break ties on
+        # the remaining columns.
+        return sa.and_(
+            columns >= values if asc else columns <= values,
+            sa.or_(
+                columns > values if asc else columns < values,
+                sa.and_(
+                    sa.and_(
+                        column == value
+                        for column, _, value in leading_column_cursors
+                    ),
+                    self.get_row_value_filter(trailing_column_cursors),
+                ),
+            ),
+        )
+
     def make_cursors(self, items, view, field_orderings):
         column_fields = self.get_column_fields(view, field_orderings)
         return tuple(
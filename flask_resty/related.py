@@ -1,6 +1,5 @@
-import functools
-
 from .exceptions import ApiError
+from .utils import is_overridden
 
 # -----------------------------------------------------------------------------
 
@@ -18,6 +17,12 @@ class RelatedId(object):
     def resolve_related_id(self, view, id):
         return view.resolve_related_id(id)
 
+    def resolve_related_ids(self, view, ids):
+        if is_overridden(self, RelatedId, 'resolve_related_id'):
+            return [self.resolve_related_id(view, id) for id in ids]
+
+        return view.resolve_related_ids(ids)
+
 
 class Related(object):
     def __init__(self, item_class=None, **kwargs):
@@ -25,55 +30,105 @@ class Related(object):
         self._resolvers = kwargs
 
     def resolve_related(self, data):
+        return self.resolve_related_items((data,))[0]
+
+    def resolve_related_items(self, data_items):
+        """Resolve related fields across multiple data items.
+
+        All values of each field are resolved together, so related ids can be
+        looked up with one query per field rather than one query per value.
+        """
         for field_name, resolver in self._resolvers.items():
             if isinstance(resolver, RelatedId):
                 data_field_name = resolver.field_name
             else:
                 data_field_name = field_name
 
-            if data_field_name not in data:
-                # If this field were required, the deserializer would already
-                # have raised an exception.
-                continue
+            field_data_items = []
+            values = []
+
+            for data in data_items:
+                if data_field_name not in data:
+                    # If this field were required, the deserializer would
+                    # already have raised an exception.
+                    continue
+
+                # Remove the data field (in case it's different) so we can
+                # keep just the output field.
+                value = data.pop(data_field_name)
 
-            # Remove the data field (in case it's different) so we can keep
-            # just the output field.
-            value = data.pop(data_field_name)
+                if value is None:
+                    # Explicitly clear the related item if the value was None.
+                    data[field_name] = None
+                    continue
 
-            if value is None:
-                # Explicitly clear the related item if the value was None.
-                data[field_name] = None
+                field_data_items.append(data)
+                values.append(value)
+
+            if not values:
                 continue
 
             try:
-                resolved = self.resolve_field(value, resolver)
+                if is_overridden(self, Related, 'resolve_field'):
+                    resolved_values = [
+                        self.resolve_field(value, resolver)
+                        for value in values
+                    ]
+                else:
+                    resolved_values = self.resolve_field_values(
+                        values, resolver,
+                    )
             except ApiError as e:
                 pointer = '/data/{}'.format(data_field_name)
                 raise e.update({'source': {'pointer': pointer}})
 
-            data[field_name] = resolved
+            for data, resolved in zip(field_data_items, resolved_values):
+                data[field_name] = resolved
 
         if self._item_class:
-            return self._item_class(**data)
+            return [self._item_class(**data) for data in data_items]
 
-        return data
+        return list(data_items)
 
     def resolve_field(self, value, resolver):
-        # marshmallow always uses lists here.
-        many = isinstance(value, list)
-        if many and not value:
-            # As a tiny optimization, there's no need to resolve an empty list.
-            return value
+        return self.resolve_field_values((value,), resolver)[0]
+
+    def resolve_field_values(self, values, resolver):
+        # Flatten the values so that list fields are resolved together with
+        # everything else. marshmallow always uses lists here.
+        flat_values = []
+        for value in values:
+            if isinstance(value, list):
+                flat_values.extend(value)
+            else:
+                flat_values.append(value)
 
-        if isinstance(resolver, Related):
-            resolve_item = resolver.resolve_related
-        elif isinstance(resolver, RelatedId):
-            view = resolver.create_view()
-            resolve_item = functools.partial(resolver.resolve_related_id, view)
+        if flat_values:
+            resolved_iter = iter(
+                self.resolve_flat_values(flat_values, resolver),
+            )
         else:
-            resolve_item = resolver().resolve_related_item
+            # As a tiny optimization, there's no need to resolve empty lists.
+            resolved_iter = iter(())
+
+        resolved_values = []
+        for value in values:
+            if isinstance(value, list):
+                resolved_values.append([next(resolved_iter) for _ in value])
+            else:
+                resolved_values.append(next(resolved_iter))
+
+        return resolved_values
 
-        if many:
-            return [resolve_item(item) for item in value]
+    def resolve_flat_values(self, values, resolver):
+        if isinstance(resolver, Related):
+            if is_overridden(resolver, Related, 'resolve_related'):
+                return [resolver.resolve_related(value) for value in values]
+
+            return resolver.resolve_related_items(values)
+
+        if isinstance(resolver, RelatedId):
+            view = resolver.create_view()
+            return resolver.resolve_related_ids(view, values)
 
-        return resolve_item(value)
+        return resolver().resolve_related_items(values)
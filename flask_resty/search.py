@@ -0,0 +1,126 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import with_expression
+
+from . import sorting
+from .filtering import ArgFilterBase
+
+# -----------------------------------------------------------------------------
+
+
+class SearchIndexBase(object):
+    """A full-text index for a model."""
+
+    def get_filter(self, view, term):
+        raise NotImplementedError()
+
+    def get_rank(self, view, term):
+        """Get the relevance of each row to the term. Higher is better."""
+        raise NotImplementedError()
+
+
+class Fts5SearchIndex(SearchIndexBase):
+    """A SQLite FTS5 table with the primary keys of the model as its rowids.
+
+    Terms are matched as quoted strings, so FTS5 query syntax in search terms
+    is not interpreted.
+
+    :param str table_name: The name of the FTS5 virtual table.
+    :param str id_field: The name of the model's primary key attribute.
+    """
+
+    def __init__(self, table_name, id_field='id'):
+        self._table = sa.table(
+            table_name, sa.column('rowid'), sa.column('rank'),
+        )
+        self._id_field = id_field
+
+    def get_filter(self, view, term):
+        id_column = getattr(view.model, self._id_field)
+        return id_column.in_(
+            sa.select([self._table.c.rowid]).where(self.get_match(term)),
+        )
+
+    def get_rank(self, view, term):
+        id_column = getattr(view.model, self._id_field)
+
+        # FTS5 ranks better matches lower.
+        return sa.select([-self._table.c.rank]).where(sa.and_(
+            self._table.c.rowid == id_column,
+            self.get_match(term),
+        )).as_scalar()
+
+    def get_match(self, term):
+        return sa.literal_column(self._table.name).op('MATCH')(
+            self.get_match_query(term),
+        )
+
+    def get_match_query(self, term):
+        return ' '.join(
+            '"{}"'.format(token.replace('"', '""')) for token in term.split()
+        )
+
+
+class TsvectorSearchIndex(SearchIndexBase):
+    """A PostgreSQL ``tsvector`` column on the model.
+
+    :param str column_name: The name of the ``tsvector`` column.
+    :param str config: The text search configuration for search terms.
+    """
+
+    def __init__(self, column_name, config='english'):
+        self._column_name = column_name
+        self._config = config
+
+    def get_filter(self, view, term):
+        return self.get_column(view).op('@@')(self.get_query(term))
+
+    def get_rank(self, view, term):
+        return sa.func.ts_rank(self.get_column(view), self.get_query(term))
+
+    def get_column(self, view):
+        return getattr(view.model, self._column_name)
+
+    def get_query(self, term):
+        return sa.func.plainto_tsquery(self._config, term)
+
+
+# -----------------------------------------------------------------------------
+
+
+class SearchFilter(ArgFilterBase):
+    """Filter by a full-text search of a `SearchIndexBase`.
+
+    When `rank_field` is set, sorting on that field orders by relevance to the
+    search term. If the model has a ``query_expression`` for that attribute,
+    it's also populated with the relevance, so the field can be serialized and
+    used in pagination cursors.
+
+    :param index: The `SearchIndexBase` to search.
+    :param str rank_field: The name of the field for the search relevance.
+    """
+
+    def __init__(self, index, rank_field=None):
+        self._index = index
+        self._rank_field = rank_field
+
+    def maybe_set_arg_name(self, arg_name):
+        pass
+
+    def filter_query(self, query, view, arg_value):
+        if arg_value is None or not arg_value.strip():
+            return query
+
+        query = query.filter(self._index.get_filter(view, arg_value))
+
+        if self._rank_field:
+            rank = self._index.get_rank(view, arg_value)
+            sorting.set_request_column(view, self._rank_field, rank)
+
+            rank_attribute = getattr(view.model, self._rank_field, None)
+            if rank_attribute is not None:
+                query = query.options(with_expression(rank_attribute, rank))
+
+        return query
+
+    def get_static_default_filter(self, view):
+        return None
@@ -1,5 +1,6 @@
 import flask
 
+from . import context
 from .exceptions import ApiError
 
 # -----------------------------------------------------------------------------
@@ -9,6 +10,26 @@ class SortingBase(object):
     def sort_query(self, query, view):
         raise NotImplementedError()
 
+    def get_arg_names(self):
+        return ()
+
+
+# -----------------------------------------------------------------------------
+
+
+def set_request_column(view, field_name, column):
+    """Sort on `field_name` by `column` for the rest of the request.
+
+    This lets filters provide sort columns that depend on the request, such as
+    the relevance to a search term.
+    """
+    request_columns = context.get_for_view(view, 'sort_columns')
+    if request_columns is None:
+        request_columns = {}
+        context.set_for_view(view, 'sort_columns', request_columns)
+
+    request_columns[field_name] = column
+
 
 # -----------------------------------------------------------------------------
 
@@ -49,7 +70,11 @@ class FieldSortingBase(SortingBase):
         return column if asc else column.desc()
 
     def get_column(self, view, field_name):
-        return getattr(view.model, field_name)
+        request_columns = context.get_for_view(view, 'sort_columns', {})
+        try:
+            return request_columns[field_name]
+        except KeyError:
+            return getattr(view.model, field_name)
 
 
 class FixedSorting(FieldSortingBase):
@@ -67,6 +92,9 @@ class Sorting(FieldSortingBase):
         self._field_names = frozenset(field_names)
         self._default_sort = kwargs.get('default')
 
+    def get_arg_names(self):
+        return (self.sort_arg,)
+
     def get_request_field_orderings(self, view):
         sort = flask.request.args.get(self.sort_arg, self._default_sort)
         if sort is None:
@@ -52,6 +52,13 @@ class ApiViewDeclaration(object):
                 }
             path['get'].add_property_to_response(prop_name='data', **data)
 
+            if view.fields_arg:
+                path['get'].add_parameter(
+                    name=view.fields_arg,
+                    type='string',
+                    description="fields to include",
+                )
+
         body_params = {
             'name': '{}Payload'.format(schema),
             'required': True,
@@ -5,6 +5,7 @@ import re
 from flask.testing import FlaskClient
 
 from .compat import basestring
+from .json_backends import get_json_backend
 from .utils import UNDEFINED
 
 # -----------------------------------------------------------------------------
@@ -19,7 +20,11 @@ class ApiClient(FlaskClient):
         if 'data' in kwargs:
             kwargs.setdefault('content_type', 'application/json')
             if kwargs['content_type'] == 'application/json':
-                kwargs['data'] = json.dumps({'data': kwargs['data']})
+                json_backend = get_json_backend(self.application)
+                with self.application.app_context():
+                    kwargs['data'] = json_backend.dumps({
+                        'data': kwargs['data'],
+                    })
 
         return super(ApiClient, self).open(full_path, *args, **kwargs)
 
@@ -12,6 +12,18 @@ def if_none(value, default):
     return value
 
 
+def is_overridden(instance, cls, method_name):
+    """Check whether the class of `instance` overrides a method of `cls`."""
+    method = getattr(type(instance), method_name)
+    base_method = getattr(cls, method_name)
+
+    # On Python 2, these are unbound methods that wrap the functions.
+    return (
+        getattr(method, '__func__', method) is not
+        getattr(base_method, '__func__', base_method)
+    )
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -38,11 +50,15 @@ class SettableProperty(object):
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        try:
-            return getattr(instance, self.internal_field_name)
-        except AttributeError:
+
+        # Checking the instance dict directly avoids raising and catching an
+        # AttributeError on every access to an unset property.
+        value = instance.__dict__.get(self.internal_field_name, UNDEFINED)
+        if value is UNDEFINED:
             return self.get_default(instance)
 
+        return value
+
     def __set__(self, instance, value):
         setattr(instance, self.internal_field_name, value)
 
@@ -1,20 +1,31 @@
+import collections
+import copy
 import itertools
+import threading
 
 import flask
 from flask.views import MethodView
 from marshmallow import fields
+import sqlalchemy as sa
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Load
 from sqlalchemy.orm.exc import NoResultFound
 from werkzeug.exceptions import NotFound
+from werkzeug.http import generate_etag
 
-from . import meta
+from . import context, json_backends, meta
 from .authentication import NoOpAuthentication
 from .authorization import NoOpAuthorization
 from .decorators import request_cached_property
 from .exceptions import ApiError
+from .instrumentation import measure_phase
+from .loading import LoadPlanner
 from .spec import ApiViewDeclaration, ModelViewDeclaration
-from .utils import iter_validation_errors, settable_property
+from .utils import (
+    is_overridden,
+    iter_validation_errors,
+    settable_property,
+)
 
 # -----------------------------------------------------------------------------
 
@@ -27,43 +38,244 @@ class ApiView(MethodView):
     authentication = NoOpAuthentication()
     authorization = NoOpAuthorization()
 
+    #: An `Instrumentation` for recording statement counts and phase timings.
+    instrumentation = None
+
+    #: The number of items to serialize at a time for streamed responses.
+    stream_chunk_size = 100
+
+    #: Whether to fall back to ETags from a hash of the response body.
+    #:
+    #: This is used when there is no cheaper item ETag. It still requires
+    #: serializing the item, but saves sending the body when not modified.
+    use_body_etags = False
+
+    #: The query arg for selecting a subset of fields to serialize, such as
+    #: ``'fields'``. Sparse fieldsets are disabled when this is not set.
+    #:
+    #: The id fields are always serialized.
+    fields_arg = None
+
+    #: The maximum number of sparse serializers to keep per view class.
+    max_sparse_serializers = 128
+
     spec_declaration = ApiViewDeclaration()
 
+    @classmethod
+    def get_request_plan(cls):
+        """Get the request-independent state for this view class.
+
+        This is resolved once per view class, when the view is added to an
+        `Api`, or otherwise on its first request.
+        """
+        try:
+            return cls.__dict__['_request_plan']
+        except KeyError:
+            request_plan = RequestPlan(cls)
+            cls._request_plan = request_plan
+            return request_plan
+
     def dispatch_request(self, *args, **kwargs):
-        self.authentication.authenticate_request()
-        self.authorization.authorize_request()
+        if self.instrumentation is None:
+            return self.dispatch_request_raw(*args, **kwargs)
+
+        return self.instrumentation.instrument_request(
+            self, self.dispatch_request_raw, *args, **kwargs
+        )
+
+    def dispatch_request_raw(self, *args, **kwargs):
+        with measure_phase('authentication'):
+            self.authentication.authenticate_request()
+        with measure_phase('authorization'):
+            self.authorization.authorize_request()
 
         return super(ApiView, self).dispatch_request(*args, **kwargs)
 
     def serialize(self, item, **kwargs):
-        return self.serializer.dump(item, **kwargs).data
+        with measure_phase('serialize'):
+            return self.serializer.dump(item, **kwargs).data
 
     @settable_property
     def serializer(self):
-        return self.schema
+        if not self.fields_arg or self.request_fields is None:
+            return self.schema
+
+        return self.get_request_plan().get_sparse_serializer(
+            self, self.request_fields,
+        )
+
+    @request_cached_property
+    def request_fields(self):
+        """The field names requested with `fields_arg`, if any."""
+        fields_raw = flask.request.args.get(self.fields_arg)
+        if fields_raw is None:
+            return None
+
+        field_names = frozenset(
+            field_name for field_name in fields_raw.split(',') if field_name
+        )
+
+        schema_fields = self.schema.fields
+        for field_name in field_names:
+            field = schema_fields.get(field_name)
+            if field is None or field.load_only:
+                raise ApiError(400, {
+                    'code': 'invalid_fields',
+                    'detail': "Unknown field: {}".format(field_name),
+                    'source': {'parameter': self.fields_arg},
+                })
+
+        return field_names.union(
+            id_field for id_field in self.id_fields
+            if id_field in schema_fields
+        )
 
     def make_items_response(self, items, *args):
+        etag = self.get_items_etag(items)
+        if self.is_not_modified(etag):
+            return self.make_not_modified_response(etag)
+
         data_out = self.serialize(items, many=True)
-        return self.make_response(data_out, *args, items=items)
+        response = self.make_response(data_out, *args, items=items)
+        return self.set_response_etag(response, etag)
+
+    def make_streamed_items_response(self, items, *args):
+        """Make a response that serializes and writes items incrementally.
+
+        This keeps peak memory bounded for large lists, as only
+        `stream_chunk_size` items are serialized at a time. Any response meta
+        is rendered after the items, so it may be set while iterating them.
+        """
+        body = flask.stream_with_context(
+            self.render_streamed_response_body(items),
+        )
+        response = flask.current_app.response_class(
+            body, mimetype='application/json',
+        )
+        return self.make_raw_response(response, *args)
+
+    def render_streamed_response_body(self, items):
+        items = iter(items)
+
+        yield '{"data": ['
+
+        separator = ''
+        while True:
+            chunk = tuple(itertools.islice(items, self.stream_chunk_size))
+            if not chunk:
+                break
+
+            for item_out in self.serialize(chunk, many=True):
+                yield separator
+                yield json_backends.dumps(item_out)
+                separator = ', '
+
+        yield ']'
+
+        self.update_instrumentation_meta()
+        response_meta = meta.get_response_meta()
+        if response_meta is not None:
+            yield ', "meta": '
+            yield json_backends.dumps(response_meta)
+
+        yield '}'
 
     def make_item_response(self, item, *args):
+        etag = self.get_item_etag(item)
+        if self.is_not_modified(etag):
+            return self.make_not_modified_response(etag)
+
         data_out = self.serialize(item)
         self.set_item_response_meta(item)
-        return self.make_response(data_out, *args, item=item)
+        response = self.make_response(data_out, *args, item=item)
+        return self.set_response_etag(response, etag)
+
+    def get_item_etag(self, item):
+        """Get an ETag for the item without serializing it, if possible."""
+        return None
+
+    def get_items_etag(self, items):
+        """Get an ETag for the items without serializing them, if possible."""
+        return None
+
+    def make_etag(self, value):
+        return generate_etag(repr(value).encode('utf-8'))
+
+    def is_not_modified(self, etag):
+        if etag is None or flask.request.method not in ('GET', 'HEAD'):
+            return False
+
+        return flask.request.if_none_match.contains_weak(etag)
+
+    def make_not_modified_response(self, etag):
+        response = self.make_raw_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    def set_response_etag(self, response, etag):
+        if etag is not None:
+            response.set_etag(etag)
+        elif self.use_body_etags:
+            response.add_etag()
+            response.make_conditional(flask.request)
+
+        return response
+
+    def validate_item_precondition(self, item):
+        if_match = flask.request.if_match
+        if not if_match:
+            return
+
+        etag = self.get_item_etag(item)
+        if etag is None and self.use_body_etags:
+            etag = self.get_item_body_etag(item)
+
+        if not if_match.contains(etag):
+            raise ApiError(412)
+
+    def get_item_body_etag(self, item):
+        """Get the ETag of the body of the item response.
+
+        This renders the body without making the response, and leaves the
+        response meta for the current request unchanged.
+        """
+        response_meta = meta.get_response_meta()
+
+        # Collect the item meta on a copy, as the rendered body must match
+        # that of the item response.
+        context.set(
+            'response_meta',
+            dict(response_meta) if response_meta is not None else None,
+        )
+        try:
+            self.set_item_response_meta(item)
+            item_response_meta = meta.get_response_meta()
+        finally:
+            context.set('response_meta', response_meta)
+
+        body = self.render_response_body(
+            self.serialize(item), item_response_meta,
+        )
+        return generate_etag(flask.make_response(body).get_data())
 
     def set_item_response_meta(self, item):
         pass
 
     def make_response(self, data, *args, **kwargs):
+        self.update_instrumentation_meta()
         body = self.render_response_body(data, meta.get_response_meta())
         return self.make_raw_response(body, *args, **kwargs)
 
+    def update_instrumentation_meta(self):
+        if self.instrumentation is not None:
+            self.instrumentation.update_response_meta()
+
     def render_response_body(self, data, response_meta):
         body = {'data': data}
         if response_meta is not None:
             body['meta'] = response_meta
 
-        return flask.jsonify(body)
+        return json_backends.jsonify(body)
 
     def make_raw_response(self, *args, **kwargs):
         response = flask.make_response(*args)
@@ -81,15 +293,27 @@ class ApiView(MethodView):
             response.headers['Location'] = location
         return response
 
+    def make_created_items_response(self, items):
+        return self.make_items_response(items, 201)
+
     def make_updated_response(self, item, return_content=False):
         if return_content:
             return self.make_item_response(item)
 
         return self.make_empty_response(item=item)
 
+    def make_updated_items_response(self, items, return_content=False):
+        if return_content:
+            return self.make_items_response(items)
+
+        return self.make_empty_response(items=items)
+
     def make_deleted_response(self, item):
         return self.make_empty_response(item=item)
 
+    def make_deleted_items_response(self, items):
+        return self.make_empty_response(items=items)
+
     def get_location(self, item):
         id_dict = {
             id_field: getattr(item, id_field) for id_field in self.id_fields
@@ -102,7 +326,7 @@ class ApiView(MethodView):
 
     def parse_request_data(self):
         try:
-            data_raw = flask.request.get_json()['data']
+            data_raw = json_backends.get_request_json()['data']
         except TypeError:
             raise ApiError(400, {'code': 'invalid_body'})
         except KeyError:
@@ -111,6 +335,9 @@ class ApiView(MethodView):
         return data_raw
 
     def deserialize(self, data_raw, expected_id=None, **kwargs):
+        if kwargs.get('many') and not isinstance(data_raw, list):
+            raise ApiError(400, {'code': 'invalid_data.not_list'})
+
         data, errors = self.deserializer.load(data_raw, **kwargs)
         if errors:
             raise ApiError(422, *(
@@ -118,7 +345,16 @@ class ApiView(MethodView):
                 for error in iter_validation_errors(errors)
             ))
 
-        self.validate_request_id(data, expected_id)
+        if not kwargs.get('many'):
+            self.validate_request_id(data, expected_id)
+            return data
+
+        for i, data_item in enumerate(data):
+            try:
+                self.validate_request_id(data_item, expected_id)
+            except ApiError as e:
+                raise self.update_item_error_pointer(e, i)
+
         return data
 
     @settable_property
@@ -137,6 +373,21 @@ class ApiView(MethodView):
             'source': {'pointer': pointer},
         }
 
+    def update_item_error_pointer(self, error, index):
+        """Point the errors from handling one item of a list at that item."""
+        item_pointer = '/data/{}'.format(index)
+
+        for error_item in error.body['errors']:
+            source = error_item.setdefault('source', {})
+            pointer = source.get('pointer')
+
+            if pointer and pointer.startswith('/data/'):
+                source['pointer'] = item_pointer + pointer[len('/data'):]
+            else:
+                source['pointer'] = item_pointer
+
+        return error
+
     def validate_request_id(self, data, expected_id):
         if expected_id is None:
             return
@@ -167,16 +418,17 @@ class ApiView(MethodView):
         args = flask.request.args
         data_raw = {}
 
-        for field_name, field in self.args_schema.fields.items():
+        args_fields = self.get_request_plan().get_args_fields(self)
+        for field_name, load_from, is_list_field in args_fields:
             if field_name in args:
                 args_key = field_name
-            elif field.load_from and field.load_from in args:
-                args_key = field.load_from
+            elif load_from and load_from in args:
+                args_key = load_from
             else:
                 continue
 
             value = args.getlist(args_key)
-            if not self.is_list_field(field) and len(value) == 1:
+            if not is_list_field and len(value) == 1:
                 value = value[0]
 
             data_raw[field_name] = value
@@ -204,6 +456,30 @@ class ApiView(MethodView):
             'source': {'parameter': parameter},
         }
 
+    def get_data_ids(self, data):
+        ids = []
+        seen_ids = set()
+
+        for i, data_item in enumerate(data):
+            try:
+                id = self.get_data_id(data_item)
+            except KeyError:
+                raise ApiError(422, {
+                    'code': 'invalid_id.missing',
+                    'source': {'pointer': '/data/{}'.format(i)},
+                })
+
+            if id in seen_ids:
+                raise ApiError(409, {
+                    'code': 'invalid_id.duplicate',
+                    'source': {'pointer': '/data/{}'.format(i)},
+                })
+
+            ids.append(id)
+            seen_ids.add(id)
+
+        return ids
+
     def get_id_dict(self, id):
         if len(self.id_fields) == 1:
             id = (id,)
@@ -220,6 +496,37 @@ class ModelView(ApiView):
 
     related = None
 
+    #: A `LoadPlanner` for query options, used when the serializer does not
+    #: define ``get_query_options``.
+    load_planner = None
+
+    #: The `LoadPlanner` for sparse fieldsets when `load_planner` is not set.
+    sparse_load_planner = LoadPlanner(load_only=True)
+
+    #: The name of a model attribute that changes whenever the item changes,
+    #: such as a version counter or an updated timestamp.
+    #:
+    #: When set, ETags are derived from this and the item id, so conditional
+    #: requests can be answered without serializing the item.
+    version_field = None
+
+    #: Whether to cache items from `get_item` for the rest of the request.
+    #:
+    #: Repeated lookups of the same id from the same view class then skip the
+    #: database, as long as the view's query filters are unchanged.
+    cache_items = True
+
+    #: A `ListCache` for serialized list responses.
+    #:
+    #: Commits from the view invalidate the cached lists for its model, so set
+    #: this on a base class shared by the views that modify the model.
+    list_cache = None
+
+    #: A `SerializedItemCache` for serialized items.
+    #:
+    #: This requires `version_field`, as items are cached by their version.
+    serialized_item_cache = None
+
     spec_declaration = ModelViewDeclaration()
 
     @settable_property
@@ -272,16 +579,147 @@ class ModelView(ApiView):
 
         By default, this calls the ``get_query_options`` method on the
         serializer with a `Load` object bound to the model, if that serializer
-        method exists.
+        method exists. Otherwise, this uses the options from `load_planner`,
+        if set, or from `sparse_load_planner` for sparse fieldsets.
         """
-        if not hasattr(self.serializer, 'get_query_options'):
-            return ()
+        if hasattr(self.serializer, 'get_query_options'):
+            return self.serializer.get_query_options(Load(self.model))
+
+        if self.load_planner is not None:
+            return self.load_planner.get_query_options(self)
 
-        return self.serializer.get_query_options(Load(self.model))
+        if self.fields_arg and self.request_fields is not None:
+            # Only load the columns and relationships for the sparse fields.
+            return self.sparse_load_planner.get_query_options(self)
+
+        return ()
+
+    def serialize(self, item, **kwargs):
+        if self.serialized_item_cache is None or set(kwargs) - {'many'}:
+            return super(ModelView, self).serialize(item, **kwargs)
+
+        if kwargs.get('many'):
+            return self.serialize_cached_items(item)
+
+        return self.serialize_cached_items((item,))[0]
+
+    def serialize_cached_items(self, items):
+        serialized_item_cache = self.serialized_item_cache
+
+        items = list(items)
+        keys = [self.get_serialized_item_key(item) for item in items]
+        data_out = [
+            serialized_item_cache.get(key) if key is not None else None
+            for key in keys
+        ]
+
+        # Serialize all the missing items together, in case the serializer
+        # does anything special when dumping many items.
+        missing_indices = [
+            i for i, item_out in enumerate(data_out) if item_out is None
+        ]
+        if missing_indices:
+            missing_data_out = super(ModelView, self).serialize(
+                [items[i] for i in missing_indices], many=True,
+            )
+
+            for i, item_out in zip(missing_indices, missing_data_out):
+                data_out[i] = item_out
+                if keys[i] is not None:
+                    serialized_item_cache.set(keys[i], item_out)
+
+        return data_out
+
+    def get_serialized_item_key(self, item):
+        version = self.get_item_version(item)
+        if version is None:
+            return None
+
+        return self.serialized_item_cache.get_key(
+            self.serializer, self.get_item_id(item), version,
+        )
+
+    def clear_serialized_item(self, item):
+        if self.serialized_item_cache is None:
+            return
+
+        key = self.get_serialized_item_key(item)
+        if key is not None:
+            self.serialized_item_cache.delete(key)
+
+    def get_item_version(self, item):
+        if not self.version_field:
+            return None
+
+        return getattr(item, self.version_field)
+
+    def get_item_etag(self, item):
+        version = self.get_item_version(item)
+        if version is None:
+            return None
+
+        return self.make_etag((self.get_item_id(item), version))
+
+    def get_items_etag(self, items):
+        if not self.version_field:
+            return None
+
+        item_versions = []
+        for item in items:
+            version = self.get_item_version(item)
+            if version is None:
+                return None
+
+            item_versions.append((self.get_item_id(item), version))
+
+        # Pagination meta such as cursors is also part of the response.
+        return self.make_etag((item_versions, meta.get_response_meta()))
 
     def get_list(self):
         return self.paginate_list_query(self.get_list_query())
 
+    def make_cached_list_response(self):
+        """Make a list response, reusing the serialized items if cached.
+
+        Cache hits skip both the list query and serialization.
+        """
+        cache_key = self.list_cache.get_key(self)
+        cached = self.list_cache.get(cache_key)
+        if cached is None:
+            items = self.get_list()
+            response_meta = meta.get_response_meta()
+            cached = (
+                self.serialize(items, many=True),
+                dict(response_meta) if response_meta is not None else None,
+                self.get_items_etag(items),
+            )
+            self.list_cache.set(cache_key, cached)
+        else:
+            meta.update_response_meta(cached[1])
+
+        data_out, _, etag = cached
+        if self.is_not_modified(etag):
+            return self.make_not_modified_response(etag)
+
+        response = self.make_response(data_out)
+        return self.set_response_etag(response, etag)
+
+    def invalidate_list_cache(self):
+        if self.list_cache is None:
+            return
+
+        self.list_cache.invalidate(self.model)
+
+    def get_streamed_list(self):
+        query = self.get_list_query()
+        if self.pagination:
+            # The page size already bounds the number of items.
+            return self.pagination.get_page(query, self)
+
+        # Iterating the query in chunks avoids loading every row at once. This
+        # does not support eager loading of collections.
+        return query.yield_per(self.stream_chunk_size)
+
     def get_list_query(self):
         query = self.query
         query = self.filter_list_query(query)
@@ -292,19 +730,22 @@ class ModelView(ApiView):
         if not self.filtering:
             return query
 
-        return self.filtering.filter_query(query, self)
+        with measure_phase('filter'):
+            return self.filtering.filter_query(query, self)
 
     def sort_list_query(self, query):
         if not self.sorting:
             return query
 
-        return self.sorting.sort_query(query, self)
+        with measure_phase('sort'):
+            return self.sorting.sort_query(query, self)
 
     def paginate_list_query(self, query):
-        if not self.pagination:
-            return query.all()
+        with measure_phase('paginate'):
+            if not self.pagination:
+                return query.all()
 
-        return self.pagination.get_page(query, self)
+            return self.pagination.get_page(query, self)
 
     def get_item_or_404(self, id, **kwargs):
         try:
@@ -314,6 +755,58 @@ class ModelView(ApiView):
 
         return item
 
+    def get_items_or_404(self, ids, **kwargs):
+        items = self.get_items(ids, **kwargs)
+
+        missing_indices = tuple(
+            i for i, id in enumerate(ids) if id not in items
+        )
+        if missing_indices:
+            raise ApiError(404, *(
+                {
+                    'code': 'not_found',
+                    'source': {'pointer': '/data/{}'.format(i)},
+                }
+                for i in missing_indices
+            ))
+
+        return [items[id] for id in ids]
+
+    def get_items(self, ids, with_for_update=False):
+        """Get the items with the given ids, using a single query.
+
+        This returns a dict mapping each id to its item. Ids that don't match
+        an item are left out.
+        """
+        if not ids:
+            return {}
+
+        items_query = self.query.filter(self.get_ids_filter(ids))
+        if with_for_update:
+            items_query = items_query.with_for_update(of=self.model)
+
+        return {self.get_item_id(item): item for item in items_query}
+
+    def get_ids_filter(self, ids):
+        if len(self.id_fields) == 1:
+            column = getattr(self.model, self.id_fields[0])
+            return column.in_(ids)
+
+        # Row value IN is not supported on all backends.
+        return sa.or_(
+            sa.and_(
+                getattr(self.model, field) == value
+                for field, value in self.get_id_dict(id).items()
+            )
+            for id in ids
+        )
+
+    def get_item_id(self, item):
+        if len(self.id_fields) == 1:
+            return getattr(item, self.id_fields[0])
+
+        return tuple(getattr(item, id_field) for id_field in self.id_fields)
+
     def get_item(
         self,
         id,
@@ -321,9 +814,17 @@ class ModelView(ApiView):
         create_missing=False,
         will_update_item=False,
     ):
+        query = self.query
+
+        # Locking reads must always go to the database.
+        if not with_for_update:
+            item = self.get_cached_item(query, id)
+            if item is not None:
+                return item
+
         try:
             # Can't use self.query.get(), because query might be filtered.
-            item_query = self.query.filter(*(
+            item_query = query.filter(*(
                 getattr(self.model, field) == value
                 for field, value in self.get_id_dict(id).items()
             ))
@@ -347,11 +848,71 @@ class ModelView(ApiView):
                 # authorization error.
                 raise e
 
+            return item
+
+        self.set_cached_item(query, id, item)
         return item
 
+    def get_cached_item(self, query, id):
+        if not self.cache_items or not flask.has_request_context():
+            return None
+
+        item_cache = context.get('item_cache')
+        if not item_cache:
+            return None
+
+        try:
+            criterion, item = item_cache[(type(self), id)]
+        except KeyError:
+            return None
+
+        # The item is only valid for the same query filters, and only while it
+        # is still live in the session.
+        if not self.compare_criteria(query.whereclause, criterion):
+            return None
+        if not sa.inspect(item).persistent:
+            return None
+
+        return item
+
+    def set_cached_item(self, query, id, item):
+        if not self.cache_items or not flask.has_request_context():
+            return
+
+        item_cache = context.get('item_cache')
+        if item_cache is None:
+            item_cache = {}
+            context.set('item_cache', item_cache)
+
+        item_cache[(type(self), id)] = (query.whereclause, item)
+
+    def clear_cached_item(self, item):
+        if not self.cache_items or not flask.has_request_context():
+            return
+
+        item_cache = context.get('item_cache')
+        if item_cache:
+            item_cache.pop((type(self), self.get_item_id(item)), None)
+
+    def compare_criteria(self, criterion, other_criterion):
+        if criterion is None or other_criterion is None:
+            return criterion is other_criterion
+
+        return criterion.compare(other_criterion)
+
     def deserialize(self, data_raw, **kwargs):
         data = super(ModelView, self).deserialize(data_raw, **kwargs)
-        return self.resolve_related(data)
+        if not kwargs.get('many'):
+            return self.resolve_related(data)
+
+        resolved = []
+        for i, data_item in enumerate(data):
+            try:
+                resolved.append(self.resolve_related(data_item))
+            except ApiError as e:
+                raise self.update_item_error_pointer(e, i)
+
+        return resolved
 
     def resolve_related(self, data):
         if not self.related:
@@ -375,6 +936,34 @@ class ModelView(ApiView):
 
         return item
 
+    def resolve_related_items(self, data_items):
+        if is_overridden(self, ModelView, 'resolve_related_item'):
+            return [self.resolve_related_item(data) for data in data_items]
+
+        ids = []
+        for data in data_items:
+            try:
+                ids.append(self.get_data_id(data))
+            except KeyError:
+                raise ApiError(422, {'code': 'invalid_related.missing_id'})
+
+        return self.resolve_related_ids(ids)
+
+    def resolve_related_ids(self, ids):
+        if is_overridden(self, ModelView, 'resolve_related_id'):
+            return [self.resolve_related_id(id) for id in ids]
+
+        items = self.get_items(ids)
+
+        # Items are keyed by their own id values, which may not compare equal
+        # to ids that deserialize to a different type, such as strings for
+        # integer columns. Look up those ids individually, as the database
+        # compares them after conversion.
+        return [
+            items[id] if id in items else self.resolve_related_id(id)
+            for id in ids
+        ]
+
     def create_missing_item(self, id):
         return self.create_item(self.get_id_dict(id))
 
@@ -398,8 +987,32 @@ class ModelView(ApiView):
         self.add_item(item)
         return item
 
+    def create_and_add_items(self, data):
+        items = []
+        for i, data_item in enumerate(data):
+            try:
+                items.append(self.create_item(data_item))
+            except ApiError as e:
+                raise self.update_item_error_pointer(e, i)
+
+        self.add_items(items)
+        return items
+
+    def add_items(self, items):
+        self.add_items_raw(items)
+
+        for i, item in enumerate(items):
+            try:
+                self.authorization.authorize_save_item(item)
+            except ApiError as e:
+                raise self.update_item_error_pointer(e, i)
+
+    def add_items_raw(self, items):
+        self.session.add_all(items)
+
     def update_item(self, item, data):
         self.authorization.authorize_update_item(item, data)
+        self.clear_serialized_item(item)
         item = self.update_item_raw(item, data) or item
         self.authorization.authorize_save_item(item)
         return item
@@ -411,6 +1024,8 @@ class ModelView(ApiView):
     def delete_item(self, item):
         self.authorization.authorize_delete_item(item)
         item = self.delete_item_raw(item) or item
+        self.clear_cached_item(item)
+        self.clear_serialized_item(item)
         return item
 
     def delete_item_raw(self, item):
@@ -427,12 +1042,17 @@ class ModelView(ApiView):
 
     def commit(self):
         try:
-            self.session.commit()
+            with measure_phase('commit'):
+                self.session.commit()
         # Don't catch DataErrors here, as they arise from bugs in validation in
         # the schema.
         except IntegrityError as e:
             raise self.resolve_integrity_error(e)
 
+        # Only invalidate after committing, so concurrent requests can't cache
+        # the old data again in the meantime.
+        self.invalidate_list_cache()
+
     def resolve_integrity_error(self, error):
         original_error = error.orig
 
@@ -463,7 +1083,14 @@ class ModelView(ApiView):
 
 
 class GenericModelView(ModelView):
-    def list(self):
+    def list(self, stream=False):
+        if stream:
+            items = self.get_streamed_list()
+            return self.make_streamed_items_response(items)
+
+        if self.list_cache is not None:
+            return self.make_cached_list_response()
+
         items = self.get_list()
         return self.make_items_response(items)
 
@@ -480,6 +1107,15 @@ class GenericModelView(ModelView):
 
         return self.make_created_response(item)
 
+    def create_many(self, allow_client_id=False):
+        expected_id = None if allow_client_id else False
+        data_in = self.get_request_data(expected_id=expected_id, many=True)
+
+        items = self.create_and_add_items(data_in)
+        self.commit()
+
+        return self.make_created_items_response(items)
+
     def update(
         self,
         id,
@@ -496,6 +1132,8 @@ class GenericModelView(ModelView):
             create_missing=create_missing,
             will_update_item=True,
         )
+        self.validate_item_precondition(item)
+
         data_in = self.get_request_data(expected_id=id, partial=partial)
 
         item = self.update_item(item, data_in) or item
@@ -503,10 +1141,131 @@ class GenericModelView(ModelView):
 
         return self.make_updated_response(item, return_content=return_content)
 
+    def update_many(
+        self,
+        with_for_update=False,
+        partial=False,
+        return_content=False,
+    ):
+        data_in = self.get_request_data(many=True, partial=partial)
+        items = self.get_items_or_404(
+            self.get_data_ids(data_in), with_for_update=with_for_update,
+        )
+
+        for i, (item, data_item) in enumerate(zip(items, data_in)):
+            try:
+                items[i] = self.update_item(item, data_item) or item
+            except ApiError as e:
+                raise self.update_item_error_pointer(e, i)
+
+        self.commit()
+
+        return self.make_updated_items_response(
+            items, return_content=return_content,
+        )
+
+    def destroy_many(self):
+        data_in = self.get_request_data(many=True, partial=True)
+        items = self.get_items_or_404(self.get_data_ids(data_in))
+
+        for i, item in enumerate(items):
+            try:
+                items[i] = self.delete_item(item) or item
+            except ApiError as e:
+                raise self.update_item_error_pointer(e, i)
+
+        self.commit()
+
+        return self.make_deleted_items_response(items)
+
     def destroy(self, id):
         item = self.get_item_or_404(id)
+        self.validate_item_precondition(item)
 
         item = self.delete_item(item) or item
         self.commit()
 
         return self.make_deleted_response(item)
+
+
+# -----------------------------------------------------------------------------
+
+
+class RequestPlan(object):
+    """Request-independent state for a view class.
+
+    This saves resolving the same schema fields on every request.
+    """
+
+    def __init__(self, view_class):
+        self._args_fields = (None, ())
+        self._sparse_serializers = (None, collections.OrderedDict())
+        self._sparse_serializers_lock = threading.Lock()
+
+    def get_args_fields(self, view):
+        args_schema = view.args_schema
+
+        # Store the schema with its fields, so replacing the args schema on a
+        # view invalidates the cached fields.
+        cached_args_schema, args_fields = self._args_fields
+        if cached_args_schema is not args_schema:
+            args_fields = tuple(
+                (field_name, field.load_from, view.is_list_field(field))
+                for field_name, field in args_schema.fields.items()
+            )
+            self._args_fields = (args_schema, args_fields)
+
+        return args_fields
+
+    def get_sparse_serializer(self, view, field_names):
+        schema = view.schema
+
+        with self._sparse_serializers_lock:
+            cached_schema, sparse_serializers = self._sparse_serializers
+            if cached_schema is not schema:
+                sparse_serializers = collections.OrderedDict()
+                self._sparse_serializers = (schema, sparse_serializers)
+
+            try:
+                sparse_serializer = sparse_serializers.pop(field_names)
+            except KeyError:
+                pass
+            else:
+                # Reinsert the serializer to mark it as most recently used.
+                sparse_serializers[field_names] = sparse_serializer
+                return sparse_serializer
+
+        # Keep the declared field order, so equivalent field sets produce
+        # identical serializers.
+        only = tuple(
+            field_name for field_name in schema.fields
+            if field_name in field_names
+        )
+        sparse_serializer = self.make_sparse_serializer(schema, only)
+
+        with self._sparse_serializers_lock:
+            sparse_serializers[field_names] = sparse_serializer
+            while len(sparse_serializers) > view.max_sparse_serializers:
+                sparse_serializers.popitem(last=False)
+
+        return sparse_serializer
+
+    def make_sparse_serializer(self, schema, only):
+        """Copy the schema with only the given fields.
+
+        This keeps the state of the schema, such as its context and options,
+        without calling its constructor again.
+        """
+        sparse_serializer = copy.copy(schema)
+        sparse_serializer.only = only
+        sparse_serializer._types_seen = set()
+
+        # The fields are bound to their schema, so they can't be shared.
+        sparse_serializer.declared_fields = copy.deepcopy(
+            schema.declared_fields, {id(schema): sparse_serializer},
+        )
+        for field in sparse_serializer.declared_fields.values():
+            field.parent = sparse_serializer
+        sparse_serializer._update_fields(many=sparse_serializer.many)
+
+        return sparse_serializer
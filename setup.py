@@ -50,7 +50,7 @@ setup(
         'Flask >= 1.0',
         'Flask-SQLAlchemy >= 1.0',
         'marshmallow >= 2.2.0',
-        'SQLAlchemy >= 1.0.0',
+        'SQLAlchemy >= 1.2.0',
         'Werkzeug >= 0.11',
     ),
     extras_require={
@@ -4,6 +4,7 @@ from flask import Flask
 from flask.testing import FlaskClient
 import flask_sqlalchemy as fsa
 import pytest
+from sqlalchemy import event
 
 from flask_resty.testing import ApiClient
 
@@ -31,6 +32,34 @@ def db(app):
     return fsa.SQLAlchemy(app)
 
 
+@pytest.yield_fixture
+def statements(db):
+    """The SELECT statements executed during the test."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.yield_fixture
+def statement_parameters(db):
+    """The parameters of the SELECT statements executed during the test."""
+    statement_parameters = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement.startswith('SELECT'):
+            statement_parameters.append(parameters)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield statement_parameters
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
 @pytest.fixture
 def client(app):
     app.test_client_class = ApiClient
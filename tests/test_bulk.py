@@ -0,0 +1,308 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import (
+    Api,
+    ApiError,
+    AuthorizeModifyMixin,
+    GenericModelView,
+    NoOpAuthorization,
+)
+from flask_resty.testing import assert_response
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String, nullable=False)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String(required=True)
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture
+def auth():
+    class WidgetAuthorization(AuthorizeModifyMixin, NoOpAuthorization):
+        def authorize_modify_item(self, item, action):
+            if item.name == "Forbidden":
+                raise ApiError(403, {'code': 'invalid_name'})
+
+    return {
+        'authorization': WidgetAuthorization(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas, auth):
+    class WidgetListView(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        authorization = auth['authorization']
+
+        def get(self):
+            return self.list()
+
+        def post(self):
+            return self.create_many()
+
+        def patch(self):
+            return self.update_many(partial=True, return_content=True)
+
+        def delete(self):
+            return self.destroy_many()
+
+    api = Api(app)
+    api.add_resource('/widgets', WidgetListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](name="Foo"),
+        models['widget'](name="Bar"),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_create_many(client):
+    response = client.post('/widgets', data=[
+        {
+            'name': "Baz",
+        },
+        {
+            'name': "Qux",
+        },
+    ])
+
+    assert_response(response, 201, [
+        {
+            'id': '3',
+            'name': "Baz",
+        },
+        {
+            'id': '4',
+            'name': "Qux",
+        },
+    ])
+
+
+def test_create_many_empty(client):
+    response = client.post('/widgets', data=[])
+    assert_response(response, 201, [])
+
+
+def test_update_many(client):
+    response = client.patch('/widgets', data=[
+        {
+            'id': '2',
+            'name': "Baz",
+        },
+        {
+            'id': '1',
+            'name': "Qux",
+        },
+    ])
+
+    assert_response(response, 200, [
+        {
+            'id': '2',
+            'name': "Baz",
+        },
+        {
+            'id': '1',
+            'name': "Qux",
+        },
+    ])
+
+
+def test_destroy_many(client):
+    response = client.delete('/widgets', data=[
+        {
+            'id': '1',
+        },
+    ])
+    assert_response(response, 204)
+
+    response = client.get('/widgets')
+    assert_response(response, 200, [
+        {
+            'id': '2',
+            'name': "Bar",
+        },
+    ])
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_error_create_many_not_list(client):
+    response = client.post('/widgets', data={
+        'name': "Bar",
+    })
+
+    assert_response(response, 400, [{
+        'code': 'invalid_data.not_list',
+    }])
+
+
+def test_error_create_many_invalid_data(client):
+    response = client.post('/widgets', data=[
+        {
+            'name': "Bar",
+        },
+        {},
+    ])
+
+    assert_response(response, 422, [{
+        'code': 'invalid_data',
+        'source': {'pointer': '/data/1/name'},
+    }])
+
+    response = client.get('/widgets')
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Foo",
+        },
+        {
+            'id': '2',
+            'name': "Bar",
+        },
+    ])
+
+
+def test_error_create_many_id_forbidden(client):
+    response = client.post('/widgets', data=[
+        {
+            'name': "Bar",
+        },
+        {
+            'id': '5',
+            'name': "Baz",
+        },
+    ])
+
+    assert_response(response, 403, [{
+        'code': 'invalid_id.forbidden',
+        'source': {'pointer': '/data/1'},
+    }])
+
+
+def test_error_create_many_unauthorized(client):
+    response = client.post('/widgets', data=[
+        {
+            'name': "Forbidden",
+        },
+    ])
+
+    assert_response(response, 403, [{
+        'code': 'invalid_name',
+        'source': {'pointer': '/data/0'},
+    }])
+
+
+def test_error_update_many_not_found(client):
+    response = client.patch('/widgets', data=[
+        {
+            'id': '3',
+            'name': "Baz",
+        },
+        {
+            'id': '1',
+            'name': "Qux",
+        },
+        {
+            'id': '4',
+            'name': "Quux",
+        },
+    ])
+
+    assert_response(response, 404, [
+        {
+            'code': 'not_found',
+            'source': {'pointer': '/data/0'},
+        },
+        {
+            'code': 'not_found',
+            'source': {'pointer': '/data/2'},
+        },
+    ])
+
+
+def test_error_update_many_id_missing(client):
+    response = client.patch('/widgets', data=[
+        {
+            'id': '1',
+            'name': "Baz",
+        },
+        {
+            'name': "Qux",
+        },
+    ])
+
+    assert_response(response, 422, [{
+        'code': 'invalid_id.missing',
+        'source': {'pointer': '/data/1'},
+    }])
+
+
+def test_error_update_many_id_duplicate(client):
+    response = client.patch('/widgets', data=[
+        {
+            'id': '1',
+            'name': "Baz",
+        },
+        {
+            'id': '1',
+            'name': "Qux",
+        },
+    ])
+
+    assert_response(response, 409, [{
+        'code': 'invalid_id.duplicate',
+        'source': {'pointer': '/data/1'},
+    }])
+
+
+def test_error_update_many_unauthorized(client):
+    response = client.patch('/widgets', data=[
+        {
+            'id': '1',
+            'name': "Baz",
+        },
+        {
+            'id': '2',
+            'name': "Forbidden",
+        },
+    ])
+
+    assert_response(response, 403, [{
+        'code': 'invalid_name',
+        'source': {'pointer': '/data/1'},
+    }])
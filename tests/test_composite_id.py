@@ -52,6 +52,12 @@ def routes(app, models, schemas):
         def post(self):
             return self.create(allow_client_id=True)
 
+        def patch(self):
+            return self.update_many(partial=True)
+
+        def delete(self):
+            return self.destroy_many()
+
     class WidgetView(WidgetViewBase):
         def get(self, id_1, id_2):
             return self.retrieve((id_1, id_2))
@@ -149,3 +155,78 @@ def test_destroy(client):
 
     retrieve_response = client.get('/widgets/1/2')
     assert_response(retrieve_response, 404)
+
+
+def test_update_many(client):
+    update_response = client.patch('/widgets', data=[
+        {
+            'id_1': '1',
+            'id_2': '3',
+            'name': "Qux",
+        },
+        {
+            'id_1': '4',
+            'id_2': '5',
+            'name': "Quux",
+        },
+    ])
+    assert_response(update_response, 204)
+
+    list_response = client.get('/widgets')
+    assert_response(list_response, 200, [
+        {
+            'id_1': '1',
+            'id_2': '2',
+            'name': "Foo",
+        },
+        {
+            'id_1': '1',
+            'id_2': '3',
+            'name': "Qux",
+        },
+        {
+            'id_1': '4',
+            'id_2': '5',
+            'name': "Quux",
+        },
+    ])
+
+
+def test_destroy_many(client):
+    destroy_response = client.delete('/widgets', data=[
+        {
+            'id_1': '1',
+            'id_2': '2',
+        },
+        {
+            'id_1': '4',
+            'id_2': '5',
+        },
+    ])
+    assert_response(destroy_response, 204)
+
+    list_response = client.get('/widgets')
+    assert_response(list_response, 200, [
+        {
+            'id_1': '1',
+            'id_2': '3',
+            'name': "Bar",
+        },
+    ])
+
+
+def test_error_destroy_many_not_found(client):
+    response = client.delete('/widgets', data=[
+        {
+            'id_1': '1',
+            'id_2': '2',
+        },
+        {
+            'id_1': '4',
+            'id_2': '2',
+        },
+    ])
+    assert_response(response, 404, [{
+        'code': 'not_found',
+        'source': {'pointer': '/data/1'},
+    }])
@@ -0,0 +1,248 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import Api, GenericModelView, meta
+from flask_resty.testing import assert_response
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String, nullable=False)
+        version = Column(Integer, nullable=False, default=1)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String(required=True)
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture
+def response_metas():
+    return []
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas, response_metas):
+    class WidgetViewBase(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        version_field = 'version'
+
+        def update_item_raw(self, item, data):
+            super(WidgetViewBase, self).update_item_raw(item, data)
+            item.version += 1
+
+    class WidgetListView(WidgetViewBase):
+        def get(self):
+            return self.list()
+
+    class WidgetView(WidgetViewBase):
+        def get(self, id):
+            return self.retrieve(id)
+
+        def patch(self, id):
+            return self.update(id, partial=True)
+
+        def delete(self, id):
+            return self.destroy(id)
+
+    class BodyEtagWidgetView(WidgetView):
+        version_field = None
+        use_body_etags = True
+
+    class MetaBodyEtagWidgetView(BodyEtagWidgetView):
+        def set_item_response_meta(self, item):
+            meta.update_response_meta({'version': item.version})
+
+        def delete(self, id):
+            response = self.destroy(id)
+            response_metas.append(meta.get_response_meta())
+            return response
+
+    api = Api(app)
+    api.add_resource(
+        '/widgets', WidgetListView, WidgetView, id_rule='<int:id>',
+    )
+    api.add_resource('/body_etag_widgets/<int:id>', BodyEtagWidgetView)
+    api.add_resource(
+        '/meta_body_etag_widgets/<int:id>', MetaBodyEtagWidgetView,
+    )
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](name="Foo"),
+        models['widget'](name="Bar"),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_retrieve(client):
+    response = client.get('/widgets/1')
+    etag = response.get_etag()[0]
+    assert etag
+
+    response = client.get('/widgets/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert not response.get_data()
+
+    response = client.get('/widgets/2', headers={'If-None-Match': etag})
+    assert_response(response, 200, {
+        'id': '2',
+        'name': "Bar",
+    })
+
+
+def test_retrieve_modified(client):
+    response = client.get('/widgets/1')
+    etag = response.get_etag()[0]
+
+    client.patch('/widgets/1', data={
+        'id': '1',
+        'name': "Baz",
+    })
+
+    response = client.get('/widgets/1', headers={'If-None-Match': etag})
+    assert_response(response, 200, {
+        'id': '1',
+        'name': "Baz",
+    })
+    assert response.get_etag()[0] != etag
+
+
+def test_list(client):
+    response = client.get('/widgets')
+    etag = response.get_etag()[0]
+    assert etag
+
+    response = client.get('/widgets', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+    client.delete('/widgets/2')
+
+    response = client.get('/widgets', headers={'If-None-Match': etag})
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Foo",
+        },
+    ])
+
+
+def test_body_etag(client):
+    response = client.get('/body_etag_widgets/1')
+    etag = response.get_etag()[0]
+    assert etag
+
+    response = client.get(
+        '/body_etag_widgets/1', headers={'If-None-Match': etag},
+    )
+    assert response.status_code == 304
+
+
+def test_update_if_match(client):
+    etag = client.get('/widgets/1').get_etag()[0]
+
+    response = client.patch(
+        '/widgets/1',
+        headers={'If-Match': etag},
+        data={
+            'id': '1',
+            'name': "Baz",
+        },
+    )
+    assert_response(response, 204)
+
+
+def test_update_body_etag_if_match(client):
+    etag = client.get('/body_etag_widgets/1').get_etag()[0]
+
+    response = client.patch(
+        '/body_etag_widgets/1',
+        headers={'If-Match': etag},
+        data={
+            'id': '1',
+            'name': "Baz",
+        },
+    )
+    assert_response(response, 204)
+
+
+def test_destroy_body_etag_if_match_meta(client, response_metas):
+    response = client.get('/meta_body_etag_widgets/1')
+    assert response.get_json()['meta'] == {'version': 1}
+    etag = response.get_etag()[0]
+
+    response = client.delete(
+        '/meta_body_etag_widgets/1', headers={'If-Match': etag},
+    )
+    assert_response(response, 204)
+    assert not response.get_etag()[0]
+
+    # Checking the precondition doesn't set the response meta.
+    assert response_metas == [None]
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_error_update_if_match(client):
+    etag = client.get('/widgets/1').get_etag()[0]
+
+    client.patch('/widgets/1', data={
+        'id': '1',
+        'name': "Baz",
+    })
+
+    response = client.patch(
+        '/widgets/1',
+        headers={'If-Match': etag},
+        data={
+            'id': '1',
+            'name': "Qux",
+        },
+    )
+    assert_response(response, 412, [{
+        'code': 'precondition_failed',
+    }])
+
+    response = client.get('/widgets/1')
+    assert_response(response, 200, {
+        'id': '1',
+        'name': "Baz",
+    })
+
+
+def test_error_destroy_if_match(client):
+    etag = client.get('/widgets/2').get_etag()[0]
+
+    response = client.delete('/widgets/1', headers={'If-Match': etag})
+    assert_response(response, 412, [{
+        'code': 'precondition_failed',
+    }])
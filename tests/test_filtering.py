@@ -1,6 +1,10 @@
+import gc
 import operator
+import weakref
 
+import flask
 from marshmallow import fields, Schema, validate
+from mock import Mock, patch
 import pytest
 from sqlalchemy import Column, Integer, String
 
@@ -11,6 +15,7 @@ from flask_resty import (
     GenericModelView,
     model_filter,
     ModelFilter,
+    OperatorFilters,
 )
 from flask_resty.testing import assert_response
 
@@ -53,8 +58,13 @@ def filter_fields():
     def filter_color_custom(model, value):
         return model.color == value
 
+    @model_filter(fields.Boolean(missing=True), separator=None)
+    def filter_color_header(model, value):
+        return model.color == flask.request.headers['X-Color']
+
     return {
         'color_custom': filter_color_custom,
+        'color_header': filter_color_header,
     }
 
 
@@ -125,11 +135,34 @@ def routes(app, models, schemas, filter_fields):
         def get(self):
             return self.list()
 
+    class WidgetRequestDefaultFiltersView(WidgetViewBase):
+        filtering = Filtering(
+            color=filter_fields['color_header'],
+        )
+
+        def get(self):
+            return self.list()
+
+    class WidgetOperatorsListView(WidgetViewBase):
+        filtering = Filtering(
+            color=OperatorFilters(operators=('eq', 'prefix', 'isnull')),
+            size=OperatorFilters(),
+            size_alias=OperatorFilters('size', operators=('gt',)),
+            size_prefix=OperatorFilters('size', operators=('prefix',)),
+        )
+
+        def get(self):
+            return self.list()
+
     api = Api(app)
     api.add_resource('/widgets', WidgetListView)
     api.add_resource('/widgets_size_required', WidgetSizeRequiredListView)
     api.add_resource('/widgets_color_custom', WidgetColorCustomListView)
     api.add_resource('/widgets_default_filters', WidgetDefaultFiltersView)
+    api.add_resource(
+        '/widgets_request_default_filters', WidgetRequestDefaultFiltersView,
+    )
+    api.add_resource('/widgets_operators', WidgetOperatorsListView)
 
 
 @pytest.fixture(autouse=True)
@@ -194,6 +227,30 @@ def test_eq_many_custom_separator(client):
     ])
 
 
+def test_eq_many_in(client, statements, statement_parameters):
+    client.get('/widgets?color=green,blue')
+    client.get('/widgets?color=green,blue,red')
+
+    assert ' IN (' in statements[0]
+    assert ' OR ' not in statements[0]
+
+    # The expanding parameter renders one parameter per value.
+    assert len(statement_parameters[0]) == 2
+    assert len(statement_parameters[1]) == 3
+
+
+def test_eq_many_long(client, statements, statement_parameters):
+    colors = ['color{}'.format(i) for i in range(999)] + ['blue']
+
+    response = client.get('/widgets?color={}'.format(','.join(colors)))
+    assert_response(response, 200, [
+        {'id': '3', 'color': 'blue'},
+    ])
+
+    assert len(statements) == 1
+    assert len(statement_parameters[0]) == 1000
+
+
 def test_eq_empty_custom_column_element(client):
     response = client.get('/widgets?size=')
     assert_response(response, 200, [])
@@ -262,6 +319,17 @@ def test_column_filter_skip_invalid(client):
     assert_response(response, 200, [])
 
 
+def test_column_filter_skip_invalid_many(client):
+    response = client.get('/widgets?size_skip_invalid=2,foo,3')
+    assert_response(response, 200, [
+        {'id': '2', 'size': 2},
+        {'id': '3', 'size': 3},
+    ])
+
+    invalid_response = client.get('/widgets?size_skip_invalid=foo,bar')
+    assert_response(invalid_response, 200, [])
+
+
 def test_model_filter(client):
     response = client.get('/widgets?size_is_odd=true')
     assert_response(response, 200, [
@@ -319,6 +387,135 @@ def test_model_filter_default_override(client):
     ])
 
 
+def test_default_filters_cached(client):
+    with patch.object(
+        ColumnFilter, 'get_default_filter', autospec=True,
+        side_effect=ColumnFilter.get_default_filter,
+    ) as get_default_filter:
+        for _ in range(2):
+            response = client.get('/widgets_default_filters')
+            assert_response(response, 200, [{'id': '1'}])
+
+    assert get_default_filter.call_count == 1
+
+
+def test_default_filters_request_dependent(client):
+    response = client.get(
+        '/widgets_request_default_filters', headers={'X-Color': 'green'},
+    )
+    assert_response(response, 200, [{'id': '2'}])
+
+    response = client.get(
+        '/widgets_request_default_filters', headers={'X-Color': 'blue'},
+    )
+    assert_response(response, 200, [{'id': '3'}])
+
+
+def test_missing_args_skipped(client):
+    with patch.object(
+        ColumnFilter, 'filter_query', autospec=True,
+        side_effect=ColumnFilter.filter_query,
+    ) as filter_query:
+        response = client.get('/widgets?size_min=2&color=blue')
+        assert_response(response, 200, [{'id': '3'}])
+
+    # Only the filter with a custom operator runs for its missing arg.
+    arg_values = [call[0][3] for call in filter_query.call_args_list]
+    assert len(arg_values) == 3
+    assert set(arg_values) == {None, '2', 'blue'}
+
+
+def test_filter_order(client, statements):
+    client.get('/widgets?size_min=2&color=blue')
+    client.get('/widgets?color=blue&size_min=2')
+
+    assert statements[0] == statements[1]
+
+
+@pytest.mark.parametrize('query_string, ids', (
+    ('size=2', ('2',)),
+    ('size[ne]=2', ('1', '3', '4')),
+    ('size[gt]=2', ('3', '4')),
+    ('size[gte]=2&size[lt]=6', ('2', '3')),
+    ('size[lte]=2', ('1', '2')),
+    ('size[in]=1,3', ('1', '3')),
+    ('size[range]=2,3', ('2', '3')),
+    ('size_alias[gt]=3', ('4',)),
+    ('color[prefix]=gr', ('2',)),
+    ('color[prefix]=%', ()),
+    ('color[prefix]=r_d', ()),
+    ('color[isnull]=false', ('1', '2', '3', '4')),
+    ('color[isnull]=true', ()),
+))
+def test_operators(client, query_string, ids):
+    response = client.get('/widgets_operators?{}'.format(query_string))
+    assert_response(response, 200, [{'id': id} for id in ids])
+
+
+def test_operators_prefix_like(client, statements):
+    client.get('/widgets_operators?color[prefix]=gr')
+    assert 'LIKE' in statements[0]
+    assert 'lower(' not in statements[0]
+
+
+def test_operators_prefix_not_default(client):
+    response = client.get('/widgets_operators?size[prefix]=1')
+    assert_response(response, 200, [
+        {'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'},
+    ])
+
+
+def test_operators_unknown():
+    with pytest.raises(TypeError, match="unknown filter operator"):
+        OperatorFilters(operators=('foo',))
+
+
+def test_column_filter_fields(schemas):
+    column_filter = ColumnFilter('size', operator.eq, required=True)
+    view = Mock(deserializer=schemas['widget'])
+
+    field = column_filter.get_field(view)
+    assert field.required
+    assert not view.deserializer.fields['size'].required
+    assert field.parent is view.deserializer
+
+    assert column_filter.get_field(view) is field
+
+
+def test_column_filter_fields_schema_instances(schemas):
+    column_filter = ColumnFilter('size', operator.eq)
+    widget_schema_class = type(schemas['widget'])
+
+    deserializer = widget_schema_class()
+    column_filter.get_field(Mock(deserializer=deserializer))
+    deserializer_ref = weakref.ref(deserializer)
+    del deserializer
+
+    for _ in range(1000):
+        view = Mock(deserializer=widget_schema_class())
+        field = column_filter.get_field(view)
+        assert field.parent is view.deserializer
+
+    del view, field
+    gc.collect()
+
+    assert len(column_filter._fields) == 1
+    assert deserializer_ref() is None
+
+
+def test_column_filter_fields_schema_classes(schemas):
+    column_filter = ColumnFilter('size', operator.eq)
+    base_field = schemas['widget'].fields['size']
+
+    for _ in range(1000):
+        deserializer_class = type('Deserializer', (object,), {})
+        deserializer = deserializer_class()
+        deserializer.fields = {'size': base_field}
+        column_filter.get_field(Mock(deserializer=deserializer))
+
+    assert len(column_filter._fields) == ColumnFilter.max_fields
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -365,6 +562,31 @@ def test_error_model_filter_required_missing(client):
     }])
 
 
+def test_error_operators_invalid_type(client):
+    response = client.get('/widgets_operators?size[gte]=foo')
+    assert_response(response, 400, [{
+        'code': 'invalid_filter',
+        'detail': 'Not a valid integer.',
+        'source': {'parameter': 'size[gte]'},
+    }])
+
+
+def test_error_operators_invalid_range(client):
+    response = client.get('/widgets_operators?size[range]=1,2,3')
+    assert_response(response, 400, [{
+        'code': 'invalid_filter.range',
+        'source': {'parameter': 'size[range]'},
+    }])
+
+
+def test_error_operators_prefix_not_string(client):
+    response = client.get('/widgets_operators?size_prefix[prefix]=1')
+    assert_response(response, 400, [{
+        'code': 'invalid_filter.prefix',
+        'source': {'parameter': 'size_prefix[prefix]'},
+    }])
+
+
 def test_error_missing_operator():
     ColumnFilter(operator=operator.eq)
 
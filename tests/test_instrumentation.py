@@ -0,0 +1,164 @@
+from marshmallow import fields, Schema
+from mock import Mock
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import (
+    Api,
+    Filtering,
+    GenericModelView,
+    get_request_metrics,
+    Instrumentation,
+    LimitPagination,
+    RequestMetrics,
+    Sorting,
+)
+from flask_resty.testing import assert_response, get_body
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String()
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture
+def callback():
+    return Mock()
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas, callback):
+    class WidgetViewBase(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        filtering = Filtering(
+            name=lambda name, value: name == value,
+        )
+        sorting = Sorting('id')
+        pagination = LimitPagination()
+
+        instrumentation = Instrumentation(meta=True, callback=callback)
+
+    class WidgetListView(WidgetViewBase):
+        def get(self):
+            return self.list()
+
+        def post(self):
+            return self.create()
+
+    class ServerTimingWidgetListView(WidgetListView):
+        instrumentation = Instrumentation(server_timing=True)
+
+    class UninstrumentedWidgetListView(WidgetListView):
+        instrumentation = None
+
+        def get(self):
+            assert get_request_metrics() is None
+            return self.list()
+
+    api = Api(app)
+    api.add_resource('/widgets', WidgetListView)
+    api.add_resource('/server_timing_widgets', ServerTimingWidgetListView)
+    api.add_resource('/uninstrumented_widgets', UninstrumentedWidgetListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](name="Foo"),
+        models['widget'](name="Bar"),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_meta(client):
+    response = client.get('/widgets?name=Foo&sort=id')
+    assert_response(response, 200, [
+        {'id': '1', 'name': "Foo"},
+    ])
+
+    metrics = get_body(response)['meta']['metrics']
+    assert metrics['statement_count'] == 1
+    assert metrics['statement_time'] >= 0
+    assert set(metrics['phase_times']) == {
+        'authentication',
+        'authorization',
+        'filter',
+        'sort',
+        'paginate',
+        'serialize',
+    }
+
+
+def test_commit(client):
+    response = client.post('/widgets', data={
+        'name': "Baz",
+    })
+    assert_response(response, 201)
+
+    metrics = get_body(response)['meta']['metrics']
+    assert 'commit' in metrics['phase_times']
+    assert metrics['statement_count'] >= 1
+
+
+def test_callback(client, callback):
+    client.get('/widgets')
+
+    assert callback.call_count == 1
+    view, metrics = callback.call_args[0]
+    assert isinstance(view, GenericModelView)
+    assert isinstance(metrics, RequestMetrics)
+    assert metrics.statement_count == 1
+
+
+def test_callback_error(client, callback):
+    response = client.get('/widgets?limit=foo')
+    assert_response(response, 400)
+
+    assert callback.call_count == 1
+
+
+def test_server_timing(client):
+    response = client.get('/server_timing_widgets')
+    assert_response(response, 200)
+    assert 'metrics' not in get_body(response)['meta']
+
+    server_timing = response.headers['Server-Timing']
+    assert server_timing.startswith('db;dur=')
+    assert 'desc="1 statements"' in server_timing
+    assert 'serialize;dur=' in server_timing
+
+
+def test_uninstrumented(client):
+    response = client.get('/uninstrumented_widgets')
+    assert_response(response, 200)
+    assert 'Server-Timing' not in response.headers
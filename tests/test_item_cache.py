@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import Column, Integer
+from sqlalchemy.orm.exc import NoResultFound
+
+from flask_resty import ModelView
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        size = Column(Integer)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def views(models):
+    class WidgetView(ModelView):
+        model = models['widget']
+
+    class UncachedWidgetView(WidgetView):
+        cache_items = False
+
+    return {
+        'widget': WidgetView,
+        'uncached_widget': UncachedWidgetView,
+    }
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](size=1),
+        models['widget'](size=2),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_cached(app, views, statements):
+    with app.test_request_context():
+        item = views['widget']().get_item(1)
+        assert views['widget']().get_item(1) is item
+
+        assert views['widget']().get_item(2) is not item
+
+    assert len(statements) == 2
+
+
+def test_cached_per_request(app, views, statements):
+    with app.test_request_context():
+        views['widget']().get_item(1)
+
+    with app.test_request_context():
+        views['widget']().get_item(1)
+
+    assert len(statements) == 2
+
+
+def test_with_for_update(app, views, statements):
+    with app.test_request_context():
+        item = views['widget']().get_item(1)
+        assert views['widget']().get_item(1, with_for_update=True) is item
+
+    assert len(statements) == 2
+
+
+def test_query_changed(app, views, statements):
+    with app.test_request_context():
+        views['widget']().get_item(1)
+
+        view = views['widget']()
+        view.query = view.query.filter_by(size=2)
+        with pytest.raises(NoResultFound):
+            view.get_item(1)
+
+    assert len(statements) == 2
+
+
+def test_deleted(app, db, views):
+    with app.test_request_context():
+        view = views['widget']()
+
+        view.delete_item(view.get_item(1))
+        db.session.flush()
+
+        with pytest.raises(NoResultFound):
+            view.get_item(1)
+
+
+def test_disabled(app, views, statements):
+    with app.test_request_context():
+        views['uncached_widget']().get_item(1)
+        views['uncached_widget']().get_item(1)
+
+    assert len(statements) == 2
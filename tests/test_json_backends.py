@@ -0,0 +1,161 @@
+import datetime
+import uuid
+
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import Api, GenericModelView, meta
+from flask_resty.json_backends import (
+    get_json_backend,
+    JsonBackendBase,
+    StdlibJsonBackend,
+)
+from flask_resty.testing import assert_response, get_meta
+
+# -----------------------------------------------------------------------------
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String, nullable=False)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String(required=True)
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas):
+    class WidgetListView(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        def get(self):
+            meta.update_response_meta({
+                'date': datetime.date(2018, 1, 2),
+                'datetime': datetime.datetime(2018, 1, 2, 3, 4, 5),
+                'uuid': uuid.UUID('a3f3a4b8-3a0b-4b7e-9b2b-6f3c5e8e9a10'),
+            })
+            return self.list()
+
+        def post(self):
+            return self.create()
+
+    api = Api(app)
+    api.add_resource('/widgets', WidgetListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add(models['widget'](name="Foo"))
+    db.session.commit()
+
+
+@pytest.fixture(params=(
+    'stdlib',
+    pytest.param('orjson', marks=pytest.mark.skipif(
+        orjson is None, reason="orjson not installed",
+    )),
+), autouse=True)
+def json_backend(app, request):
+    app.config['RESTY_JSON_BACKEND'] = request.param
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_list(client):
+    response = client.get('/widgets')
+
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Foo",
+        },
+    ])
+    assert get_meta(response) == {
+        'date': 'Tue, 02 Jan 2018 00:00:00 GMT',
+        'datetime': 'Tue, 02 Jan 2018 03:04:05 GMT',
+        'uuid': 'a3f3a4b8-3a0b-4b7e-9b2b-6f3c5e8e9a10',
+    }
+
+
+def test_create(client):
+    response = client.post('/widgets', data={
+        'name': "Bar",
+    })
+
+    assert_response(response, 201, {
+        'id': '2',
+        'name': "Bar",
+    })
+
+
+def test_error_invalid_json(base_client):
+    response = base_client.post(
+        '/widgets',
+        content_type='application/json',
+        data='{',
+    )
+
+    assert_response(response, 400, [{
+        'code': 'bad_request',
+    }])
+
+
+def test_error_missing_data(base_client):
+    response = base_client.post(
+        '/widgets',
+        content_type='application/json',
+        data='{}',
+    )
+
+    assert_response(response, 400, [{
+        'code': 'invalid_data.missing',
+    }])
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_custom_backend(app):
+    class CustomJsonBackend(JsonBackendBase):
+        pass
+
+    custom_backend = CustomJsonBackend()
+    app.config['RESTY_JSON_BACKEND'] = custom_backend
+
+    assert get_json_backend(app) is custom_backend
+
+
+def test_default_backend(app):
+    del app.config['RESTY_JSON_BACKEND']
+
+    assert isinstance(get_json_backend(app), StdlibJsonBackend)
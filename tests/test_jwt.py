@@ -1,22 +1,58 @@
 import json
+import threading
+import time
 
+import flask
 from marshmallow import fields, Schema
+from mock import Mock, patch
 import pytest
 from sqlalchemy import Column, Integer, String
 
-from flask_resty import Api, GenericModelView, HasAnyCredentialsAuthorization
+from flask_resty import (
+    Api,
+    ApiError,
+    GenericModelView,
+    HasAnyCredentialsAuthorization,
+)
 from flask_resty.testing import assert_response
 
 # -----------------------------------------------------------------------------
 
 try:
-    from flask_resty import JwtAuthentication, JwkSetAuthentication
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import jwt
+
+    from flask_resty import (
+        JwkSetAuthentication,
+        JwtAuthentication,
+        RemoteJwkSetProvider,
+        TokenCache,
+    )
 except ImportError:
     pytestmark = pytest.mark.skip(reason="JWT support not installed")
 
 # -----------------------------------------------------------------------------
 
 
+def load_jwk_set(path):
+    with open(path, 'r') as rsa_pub_file:
+        return json.load(rsa_pub_file)
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+# -----------------------------------------------------------------------------
+
+
 class AbstractTestJwt(object):
     @pytest.yield_fixture
     def models(self, db):
@@ -185,6 +221,98 @@ class TestJwt(AbstractTestJwt):
     def invalid_token(self, request):
         return request.param
 
+    def test_reset_decode_args(self, app, client, auth, token):
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+        assert_response(client.get('/widgets', headers=headers), 200)
+
+        # The decode args are resolved once per app.
+        app.config['RESTY_JWT_DECODE_KEY'] = 'other secret'
+        assert_response(client.get('/widgets', headers=headers), 200)
+
+        auth['authentication'].reset_jwt_decode_args(app)
+        assert_response(client.get('/widgets', headers=headers), 401, [{
+            'code': 'invalid_token',
+        }])
+
+
+class TestJwtTokenCache(TestJwt):
+    @pytest.fixture
+    def auth(self, app):
+        app.config.update({
+            'RESTY_JWT_DECODE_KEY': 'secret',
+            'RESTY_JWT_DECODE_ALGORITHMS': ['HS256'],
+        })
+        authentication = JwtAuthentication(
+            issuer='resty', token_cache=TokenCache(max_size=2, ttl=60),
+        )
+
+        class UserAuthorization(HasAnyCredentialsAuthorization):
+            def filter_query(self, query, view):
+                return query.filter_by(
+                    owner_id=self.get_request_credentials()['sub'],
+                )
+
+        return {
+            'authentication': authentication,
+            'authorization': UserAuthorization(),
+        }
+
+    def test_cache(self, client, auth, token):
+        token_cache = auth['authentication'].token_cache
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert_response(client.get('/widgets', headers=headers), 200)
+
+        assert token_cache.misses == 1
+        assert token_cache.hits == 1
+
+    def test_cache_token_expired(self, client, auth):
+        token_cache = auth['authentication'].token_cache
+
+        now = time.time()
+        token = jwt.encode(
+            {'iss': 'resty', 'sub': 'foo', 'exp': int(now) + 10},
+            'secret',
+        ).decode()
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+
+        with patch('flask_resty.jwt.time.time', return_value=now + 20):
+            assert_response(client.get('/widgets', headers=headers), 200)
+
+        assert token_cache.misses == 2
+        assert token_cache.hits == 0
+
+    def test_cache_scoped_to_app(self, app, auth, token):
+        authentication = auth['authentication']
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+
+        with app.test_request_context(headers=headers):
+            assert authentication.get_request_credentials()['sub'] == 'foo'
+
+        other_app = flask.Flask(__name__)
+        other_app.config.update({
+            'RESTY_JWT_DECODE_KEY': 'other secret',
+            'RESTY_JWT_DECODE_ALGORITHMS': ['HS256'],
+        })
+
+        # The token was only verified with the key of the first app.
+        with other_app.test_request_context(headers=headers):
+            with pytest.raises(ApiError):
+                authentication.get_request_credentials()
+
+    def test_cache_max_size(self, auth):
+        token_cache = auth['authentication'].token_cache
+
+        for sub in ('foo', 'bar', 'baz'):
+            token_cache.set(sub, {'sub': sub})
+
+        assert token_cache.get('foo') is None
+        assert token_cache.get('bar') == {'sub': 'bar'}
+        assert token_cache.get('baz') == {'sub': 'baz'}
+
 
 class TestJwkSet(AbstractTestJwt):
     @pytest.fixture(
@@ -195,8 +323,7 @@ class TestJwkSet(AbstractTestJwt):
         ids=('public key', 'cert'),
     )
     def jwk_set(self, request):
-        with open(request.param, 'r') as rsa_pub_file:
-            return json.load(rsa_pub_file)
+        return load_jwk_set(request.param)
 
     @pytest.fixture()
     def auth(self, app, jwk_set):
@@ -242,3 +369,153 @@ class TestJwkSet(AbstractTestJwt):
     )
     def invalid_token(self, request):
         return request.param
+
+    def test_key_cache(self, app, client, auth, jwk_set, token):
+        authentication = auth['authentication']
+        get_key_from_jwk = Mock(wraps=authentication.get_key_from_jwk)
+        authentication.get_key_from_jwk = get_key_from_jwk
+
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert get_key_from_jwk.call_count == 1
+
+        # Replacing the JWK set invalidates the cached keys.
+        app.config['RESTY_JWT_DECODE_JWK_SET'] = dict(jwk_set)
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert get_key_from_jwk.call_count == 2
+
+
+class TestRemoteJwkSet(TestJwkSet):
+    @pytest.yield_fixture
+    def jwk_set_server(self, jwk_set):
+        responses = {'jwk_set': jwk_set, 'status': 200}
+        requests = []
+
+        class JwkSetHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(self.path)
+
+                body = json.dumps(responses['jwk_set']).encode('utf-8')
+                self.send_response(responses['status'])
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), JwkSetHandler)
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={'poll_interval': 0.01},
+        )
+        thread.daemon = True
+        thread.start()
+
+        yield {
+            'url': 'http://127.0.0.1:{}/jwks'.format(server.server_port),
+            'responses': responses,
+            'requests': requests,
+        }
+
+        server.shutdown()
+        server.server_close()
+
+    @pytest.yield_fixture
+    def jwk_set_provider(self, jwk_set_server):
+        jwk_set_provider = RemoteJwkSetProvider(
+            jwk_set_server['url'], min_refresh_interval=0,
+        )
+        jwk_set_provider.refresh()
+
+        yield jwk_set_provider
+
+        jwk_set_provider.stop()
+
+    @pytest.fixture()
+    def auth(self, app, jwk_set_provider):
+        app.config.update({
+            'RESTY_JWT_DECODE_JWK_SET': jwk_set_provider,
+            'RESTY_JWT_DECODE_ALGORITHMS': ['RS256'],
+        })
+
+        authentication = JwkSetAuthentication(issuer='resty')
+
+        class UserAuthorization(HasAnyCredentialsAuthorization):
+            def filter_query(self, query, view):
+                return query.filter_by(
+                    owner_id=self.get_request_credentials()['sub'],
+                )
+
+        return {
+            'authentication': authentication,
+            'authorization': UserAuthorization(),
+        }
+
+    def test_key_cache(self, client, auth, jwk_set_provider, token):
+        authentication = auth['authentication']
+        get_key_from_jwk = Mock(wraps=authentication.get_key_from_jwk)
+        authentication.get_key_from_jwk = get_key_from_jwk
+
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert get_key_from_jwk.call_count == 1
+
+        # Each refresh provides a new JWK set.
+        jwk_set_provider.refresh()
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+        assert get_key_from_jwk.call_count == 2
+
+    def test_refresh_unknown_kid(
+        self, client, jwk_set, jwk_set_server, jwk_set_provider, token,
+    ):
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+
+        jwk_set_server['responses']['jwk_set'] = {'keys': []}
+        jwk_set_provider.refresh()
+        jwk_set_server['responses']['jwk_set'] = jwk_set
+
+        # The unknown key ID triggers a refresh in the background.
+        assert_response(client.get('/widgets', headers=headers), 401)
+        wait_for(lambda: jwk_set_provider.get_jwk_set()['keys'])
+
+        assert_response(client.get('/widgets', headers=headers), 200)
+
+    def test_refresh_rate_limited(
+        self, client, jwk_set_server, jwk_set_provider, token,
+    ):
+        jwk_set_provider.min_refresh_interval = 60
+        jwk_set_provider.start()
+
+        jwk_set_provider.request_refresh()
+        time.sleep(0.1)
+
+        assert len(jwk_set_server['requests']) == 1
+
+    def test_refresh_error(
+        self, client, jwk_set_server, jwk_set_provider, token,
+    ):
+        jwk_set_server['responses']['status'] = 500
+        assert not jwk_set_provider.refresh()
+
+        # The stale JWK set is still used.
+        headers = {'Authorization': 'Bearer {}'.format(token)}
+        assert_response(client.get('/widgets', headers=headers), 200)
+
+    def test_refresh_background(self, jwk_set_server, jwk_set):
+        jwk_set_provider = RemoteJwkSetProvider(
+            jwk_set_server['url'], refresh_interval=0.01,
+        )
+        try:
+            assert jwk_set_provider.get_jwk_set() == {'keys': ()}
+            wait_for(lambda: len(jwk_set_server['requests']) >= 2)
+        finally:
+            jwk_set_provider.stop()
+
+        assert jwk_set_provider.get_jwk_set() == jwk_set
@@ -0,0 +1,307 @@
+import flask
+from marshmallow import fields, Schema
+from mock import Mock
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import (
+    Api,
+    AuthenticationBase,
+    Filtering,
+    GenericModelView,
+    ListCache,
+    MemoryCacheStore,
+    NoOpAuthorization,
+    PagePagination,
+    Sorting,
+)
+from flask_resty.testing import assert_response
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        owner_id = Column(String)
+        size = Column(Integer)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        owner_id = fields.String()
+        size = fields.Integer()
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture
+def list_cache():
+    return ListCache()
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas, list_cache):
+    widget_list_cache = list_cache
+
+    class FakeAuthentication(AuthenticationBase):
+        def get_request_credentials(self):
+            return flask.request.args.get('user_id')
+
+    class OwnerAuthorization(NoOpAuthorization):
+        def filter_query(self, query, view):
+            return query.filter(
+                view.model.owner_id == self.get_request_credentials(),
+            )
+
+    class WidgetViewBase(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        authentication = FakeAuthentication()
+        authorization = OwnerAuthorization()
+
+        filtering = Filtering(
+            size=lambda size, value: size == value,
+        )
+        sorting = Sorting('id', 'size')
+        pagination = PagePagination(2)
+
+        list_cache = widget_list_cache
+
+    class WidgetListView(WidgetViewBase):
+        def get(self):
+            return self.list()
+
+        def post(self):
+            return self.create()
+
+    class WidgetView(WidgetViewBase):
+        def patch(self, id):
+            return self.update(id, partial=True)
+
+        def delete(self, id):
+            return self.destroy(id)
+
+    class OwnerWidgetListView(WidgetViewBase):
+        @property
+        def query(self):
+            return super(OwnerWidgetListView, self).query.filter_by(
+                owner_id=flask.request.view_args['owner_id'],
+            )
+
+        def get(self, owner_id):
+            return self.list()
+
+    api = Api(app)
+    api.add_resource(
+        '/widgets', WidgetListView, WidgetView, id_rule='<int:id>',
+    )
+    api.add_resource('/owners/<owner_id>/widgets', OwnerWidgetListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](owner_id='foo', size=1),
+        models['widget'](owner_id='foo', size=2),
+        models['widget'](owner_id='foo', size=1),
+        models['widget'](owner_id='bar', size=1),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_cached(client, statements):
+    response = client.get('/widgets?user_id=foo')
+    assert_response(response, 200, [
+        {'id': '1', 'size': 1},
+        {'id': '2', 'size': 2},
+    ])
+    assert response.get_json()['meta'] == {'has_next_page': True}
+    assert len(statements) == 1
+
+    cached_response = client.get('/widgets?user_id=foo')
+    assert cached_response.get_json() == response.get_json()
+    assert len(statements) == 1
+
+
+def test_args(client, statements):
+    client.get('/widgets?user_id=foo&size=1&sort=-id&page=0')
+    assert len(statements) == 1
+
+    # Args are normalized by name, and unrelated args are ignored.
+    response = client.get('/widgets?page=0&sort=-id&size=1&user_id=foo&x=y')
+    assert_response(response, 200, [
+        {'id': '3', 'size': 1},
+        {'id': '1', 'size': 1},
+    ])
+    assert len(statements) == 1
+
+    for query_string in ('size=2', 'sort=id', 'page=1'):
+        client.get('/widgets?user_id=foo&{}'.format(query_string))
+
+    assert len(statements) == 4
+
+
+def test_credentials(client, statements):
+    client.get('/widgets?user_id=foo')
+
+    response = client.get('/widgets?user_id=bar')
+    assert_response(response, 200, [
+        {'id': '4', 'owner_id': 'bar'},
+    ])
+    assert len(statements) == 2
+
+
+def test_view_args(client, statements):
+    client.get('/owners/foo/widgets?user_id=foo')
+
+    response = client.get('/owners/bar/widgets?user_id=foo')
+    assert_response(response, 200, [])
+    assert len(statements) == 2
+
+
+def test_invalidate_create(client):
+    client.get('/widgets?user_id=foo&size=2')
+
+    client.post('/widgets?user_id=foo', data={
+        'owner_id': 'foo',
+        'size': 2,
+    })
+
+    response = client.get('/widgets?user_id=foo&size=2')
+    assert_response(response, 200, [
+        {'id': '2'},
+        {'id': '5'},
+    ])
+
+
+def test_invalidate_update(client):
+    client.get('/widgets?user_id=foo&size=2')
+
+    client.patch('/widgets/2?user_id=foo', data={
+        'id': '2',
+        'size': 3,
+    })
+
+    response = client.get('/widgets?user_id=foo&size=2')
+    assert_response(response, 200, [])
+
+
+def test_invalidate_destroy(client):
+    client.get('/widgets?user_id=bar')
+
+    client.delete('/widgets/4?user_id=bar')
+
+    response = client.get('/widgets?user_id=bar')
+    assert_response(response, 200, [])
+
+
+def test_invalidate_explicit(client, models, list_cache, statements):
+    client.get('/widgets?user_id=foo')
+    list_cache.invalidate(models['widget'])
+    client.get('/widgets?user_id=foo')
+
+    assert len(statements) == 2
+
+
+def test_ttl(client, list_cache, statements):
+    list_cache.ttl = 0
+
+    client.get('/widgets?user_id=foo')
+    client.get('/widgets?user_id=foo')
+
+    assert len(statements) == 2
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_credentials_identity_unsupported(list_cache):
+    with pytest.raises(TypeError, match="override get_credentials_identity"):
+        list_cache.get_credentials_identity(object())
+
+
+def test_credentials_identity_override():
+    class User(object):
+        def __init__(self, id):
+            self.id = id
+
+    class UserListCache(ListCache):
+        def get_credentials_identity(self, credentials):
+            return credentials.id
+
+    def get_credentials_key(user):
+        view = Mock()
+        view.authorization.get_request_credentials.return_value = user
+        return list_cache.get_credentials_key(view)
+
+    list_cache = UserListCache()
+    assert get_credentials_key(User(1)) == get_credentials_key(User(1))
+    assert get_credentials_key(User(1)) != get_credentials_key(User(2))
+
+
+def test_view_key_unique(list_cache):
+    def make_view_class():
+        class WidgetListView(object):
+            pass
+
+        return WidgetListView
+
+    view_class = make_view_class()
+    other_view_class = make_view_class()
+
+    assert (
+        list_cache.get_view_key(view_class()) ==
+        list_cache.get_view_key(view_class())
+    )
+    assert (
+        list_cache.get_view_key(view_class()) !=
+        list_cache.get_view_key(other_view_class())
+    )
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_memory_store_eviction():
+    store = MemoryCacheStore(max_size=2)
+
+    store.set('foo', 1)
+    store.set('bar', 2)
+    assert store.get('foo') == 1
+
+    store.set('baz', 3)
+    assert len(store) == 2
+    assert store.get('foo') == 1
+    assert store.get('bar') is None
+    assert store.get('baz') == 3
+
+
+def test_memory_store_evicted_generation(models, list_cache):
+    model = models['widget']
+
+    generation = list_cache.get_generation(model)
+    assert list_cache.get_generation(model) == generation
+
+    # Losing the generation must not bring back entries from before it.
+    list_cache.store.delete(list_cache.get_generation_key(model))
+    assert list_cache.get_generation(model) != generation
@@ -0,0 +1,209 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from flask_resty import (
+    Api,
+    GenericModelView,
+    LimitPagination,
+    LoadPlanner,
+    RelatedItem,
+)
+from flask_resty.testing import assert_response
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Parent(db.Model):
+        __tablename__ = 'parents'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        description = Column(String)
+
+        children = relationship('Child', backref='parent')
+
+    class Child(db.Model):
+        __tablename__ = 'children'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        description = Column(String)
+
+        parent_id = Column(ForeignKey(Parent.id))
+
+    db.create_all()
+
+    yield {
+        'parent': Parent,
+        'child': Child,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class PlannedParentSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String()
+
+        children = RelatedItem(
+            'PlannedChildSchema', many=True, exclude=('parent',),
+        )
+
+    class PlannedChildSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String()
+
+        parent = RelatedItem(PlannedParentSchema, exclude=('children',))
+
+    class PlannedParentWithChildIdsSchema(Schema):
+        id = fields.Integer(as_string=True)
+        child_ids = fields.Function(
+            lambda parent: [child.id for child in parent.children],
+        )
+
+    return {
+        'parent': PlannedParentSchema(),
+        'child': PlannedChildSchema(),
+        'parent_with_child_ids': PlannedParentWithChildIdsSchema(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas):
+    class ParentListView(GenericModelView):
+        model = models['parent']
+        schema = schemas['parent']
+
+        pagination = LimitPagination()
+        load_planner = LoadPlanner()
+
+        def get(self):
+            return self.list()
+
+    class LazyParentListView(ParentListView):
+        load_planner = LoadPlanner(strategies={'children': None})
+
+    class LoadOnlyParentListView(ParentListView):
+        load_planner = LoadPlanner(load_only=True)
+
+    class ParentWithChildIdsListView(LoadOnlyParentListView):
+        schema = schemas['parent_with_child_ids']
+
+    class ChildListView(GenericModelView):
+        model = models['child']
+        schema = schemas['child']
+
+        pagination = LimitPagination()
+        load_planner = LoadPlanner(load_only=True)
+
+        def get(self):
+            return self.list()
+
+    api = Api(app)
+    api.add_resource('/parents', ParentListView)
+    api.add_resource('/lazy_parents', LazyParentListView)
+    api.add_resource('/load_only_parents', LoadOnlyParentListView)
+    api.add_resource('/parents_with_child_ids', ParentWithChildIdsListView)
+    api.add_resource('/children', ChildListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    parents = [
+        models['parent'](name="Parent {}".format(i)) for i in range(1, 5)
+    ]
+    db.session.add_all(parents)
+    db.session.add_all(
+        models['child'](name="Child {}".format(i), parent=parent)
+        for i, parent in enumerate(parents + parents, 1)
+    )
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize('limit', (1, 4))
+def test_collection(client, statements, limit):
+    response = client.get('/parents?limit={}'.format(limit))
+    assert_response(response, 200)
+    assert len(response.get_json()['data']) == limit
+
+    assert len(statements) == 2
+
+
+@pytest.mark.parametrize('limit', (1, 4))
+def test_scalar(client, statements, limit):
+    response = client.get('/children?limit={}'.format(limit))
+    assert_response(response, 200)
+    assert len(response.get_json()['data']) == limit
+
+    assert len(statements) == 1
+
+
+def test_nested_data(client):
+    response = client.get('/parents?limit=1')
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Parent 1",
+            'children': [
+                {'id': '1', 'name': "Child 1"},
+                {'id': '5', 'name': "Child 5"},
+            ],
+        },
+    ])
+
+
+def test_strategy_override(client, statements):
+    response = client.get('/lazy_parents?limit=2')
+    assert_response(response, 200)
+
+    assert len(statements) == 3
+
+
+def test_load_only(client, statements):
+    response = client.get('/load_only_parents?limit=1')
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Parent 1",
+            'children': [
+                {'id': '1', 'name': "Child 1"},
+                {'id': '5', 'name': "Child 5"},
+            ],
+        },
+    ])
+
+    assert len(statements) == 2
+    assert all('description' not in statement for statement in statements)
+
+
+def test_load_only_scalar(client, statements):
+    response = client.get('/children?limit=1')
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Child 1",
+            'parent': {'id': '1', 'name': "Parent 1"},
+        },
+    ])
+
+    assert len(statements) == 1
+    assert 'description' not in statements[0]
+
+
+def test_load_only_opaque_field(client, statements):
+    response = client.get('/parents_with_child_ids?limit=1')
+    assert_response(response, 200, [
+        {'id': '1', 'child_ids': [1, 5]},
+    ])
+
+    # All columns are loaded, as the function field may use any of them.
+    assert 'description' in statements[0]
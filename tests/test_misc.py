@@ -210,3 +210,21 @@ def test_delete_return_item(app, views, client):
     assert_response(response, 200, {
         'id': '9',
     })
+
+
+def test_head(app, views, client):
+    api = Api(app)
+    api.add_resource('/widgets', views['widget_list'], views['widget'])
+
+    response = client.head('/widgets/1')
+    assert response.status_code == 200
+    assert not response.get_data()
+
+
+def test_request_plan(app, views):
+    api = Api(app)
+    api.add_resource('/widgets', views['widget_list'], views['widget'])
+
+    request_plan = views['widget_list'].__dict__['_request_plan']
+    assert views['widget_list'].get_request_plan() is request_plan
+    assert views['widget'].get_request_plan() is not request_plan
@@ -84,6 +84,12 @@ def routes(app, models, schemas):
         def post(self):
             return self.create()
 
+    class CountLimitOffsetWidgetListView(LimitOffsetWidgetListView):
+        pagination = LimitOffsetPagination(2, 4, count=True)
+
+    class MaxCountLimitOffsetWidgetListView(LimitOffsetWidgetListView):
+        pagination = LimitOffsetPagination(2, 4, count=True, max_count=3)
+
     class PageWidgetListView(WidgetViewBase):
         pagination = PagePagination(2)
 
@@ -93,6 +99,9 @@ def routes(app, models, schemas):
         def post(self):
             return self.create()
 
+    class CountPageWidgetListView(PageWidgetListView):
+        pagination = PagePagination(2, count=True)
+
     class RelayCursorListView(WidgetViewBase):
         sorting = Sorting('id', 'size')
         pagination = RelayCursorPagination(2)
@@ -103,12 +112,25 @@ def routes(app, models, schemas):
         def post(self):
             return self.create()
 
+    class RowValueRelayCursorListView(RelayCursorListView):
+        pagination = RelayCursorPagination(2, use_row_values=True)
+
     api = Api(app)
     api.add_resource('/max_limit_widgets', MaxLimitWidgetListView)
     api.add_resource('/optional_limit_widgets', OptionalLimitWidgetListView)
     api.add_resource('/limit_offset_widgets', LimitOffsetWidgetListView)
+    api.add_resource(
+        '/count_limit_offset_widgets', CountLimitOffsetWidgetListView,
+    )
+    api.add_resource(
+        '/max_count_limit_offset_widgets', MaxCountLimitOffsetWidgetListView,
+    )
     api.add_resource('/page_widgets', PageWidgetListView)
+    api.add_resource('/count_page_widgets', CountPageWidgetListView)
     api.add_resource('/relay_cursor_widgets', RelayCursorListView)
+    api.add_resource(
+        '/row_value_relay_cursor_widgets', RowValueRelayCursorListView,
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -368,6 +390,100 @@ def test_limit_offset_create(client):
     assert 'meta' not in get_body(response)
 
 
+def test_limit_offset_count(client):
+    response = client.get('/count_limit_offset_widgets?offset=2')
+
+    assert_response(response, 200, [
+        {
+            'id': '3',
+            'size': 3,
+        },
+        {
+            'id': '4',
+            'size': 1,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'total_count': 6,
+    }
+
+
+def test_limit_offset_count_filtered(client):
+    response = client.get('/count_limit_offset_widgets?size=2&limit=1')
+
+    assert_response(response, 200, [
+        {
+            'id': '2',
+            'size': 2,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'total_count': 2,
+    }
+
+
+def test_limit_offset_count_offset_end(client):
+    response = client.get('/count_limit_offset_widgets?offset=10')
+
+    assert_response(response, 200, [])
+    assert get_meta(response) == {
+        'has_next_page': False,
+        'total_count': 6,
+    }
+
+
+def test_limit_offset_count_empty(client):
+    response = client.get('/count_limit_offset_widgets?size=4')
+
+    assert_response(response, 200, [])
+    assert get_meta(response) == {
+        'has_next_page': False,
+        'total_count': 0,
+    }
+
+
+def test_limit_offset_max_count(client):
+    response = client.get('/max_count_limit_offset_widgets')
+
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'size': 1,
+        },
+        {
+            'id': '2',
+            'size': 2,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'total_count': 3,
+        'total_count_capped': True,
+    }
+
+
+def test_limit_offset_max_count_uncapped(client):
+    response = client.get('/max_count_limit_offset_widgets?size=1')
+
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'size': 1,
+        },
+        {
+            'id': '4',
+            'size': 1,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': False,
+        'total_count': 2,
+        'total_count_capped': False,
+    }
+
+
 def test_page(client):
     response = client.get('/page_widgets?page=1')
 
@@ -404,6 +520,25 @@ def test_page_default(client):
     }
 
 
+def test_page_count(client):
+    response = client.get('/count_page_widgets?page=2')
+
+    assert_response(response, 200, [
+        {
+            'id': '5',
+            'size': 2,
+        },
+        {
+            'id': '6',
+            'size': 3,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': False,
+        'total_count': 6,
+    }
+
+
 def test_page_create(client):
     response = client.post('/page_widgets', data={
         'size': 1,
@@ -544,6 +679,102 @@ def test_relay_cursor_sorted_inverse(client):
     }
 
 
+@pytest.mark.parametrize('path', (
+    '/relay_cursor_widgets',
+    '/row_value_relay_cursor_widgets',
+))
+def test_relay_cursor_sorted_mixed(client, path):
+    response = client.get('{}?sort=size,-id&cursor=MQ.NA'.format(path))
+
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'size': 1,
+        },
+        {
+            'id': '5',
+            'size': 2,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'cursors': [
+            'MQ.MQ',
+            'Mg.NQ',
+        ],
+    }
+
+
+def test_row_value_relay_cursor(client):
+    response = client.get('/row_value_relay_cursor_widgets?cursor=MQ')
+
+    assert_response(response, 200, [
+        {
+            'id': '2',
+            'size': 2,
+        },
+        {
+            'id': '3',
+            'size': 3,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'cursors': [
+            'Mg',
+            'Mw',
+        ],
+    }
+
+
+def test_row_value_relay_cursor_sorted(client):
+    response = client.get(
+        '/row_value_relay_cursor_widgets?sort=size&cursor=MQ.MQ',
+    )
+
+    assert_response(response, 200, [
+        {
+            'id': '4',
+            'size': 1,
+        },
+        {
+            'id': '2',
+            'size': 2,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'cursors': [
+            'MQ.NA',
+            'Mg.Mg',
+        ],
+    }
+
+
+def test_row_value_relay_cursor_sorted_inverse(client):
+    response = client.get(
+        '/row_value_relay_cursor_widgets?sort=-size&cursor=Mg.NQ',
+    )
+
+    assert_response(response, 200, [
+        {
+            'id': '2',
+            'size': 2,
+        },
+        {
+            'id': '4',
+            'size': 1,
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+        'cursors': [
+            'Mg.Mg',
+            'MQ.NA',
+        ],
+    }
+
+
 def test_relay_cursor_create(client):
     response = client.post('/relay_cursor_widgets', data={
         'size': 1,
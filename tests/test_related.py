@@ -45,6 +45,7 @@ def schemas():
 
         children = RelatedItem('ChildSchema', many=True, exclude=('parent',))
         child_ids = fields.List(fields.Integer(as_string=True), load_only=True)
+        child_string_ids = fields.List(fields.String(), load_only=True)
 
     class ChildSchema(Schema):
         @classmethod
@@ -67,8 +68,20 @@ def schemas():
     }
 
 
+@pytest.fixture
+def resolved_ids():
+    return []
+
+
 @pytest.fixture(autouse=True)
-def routes(app, models, schemas):
+def routes(app, models, schemas, resolved_ids):
+    class RecordingRelatedId(RelatedId):
+        def resolve_related_id(self, view, id):
+            resolved_ids.append(id)
+            return super(RecordingRelatedId, self).resolve_related_id(
+                view, id,
+            )
+
     class ParentView(GenericModelView):
         model = models['parent']
         schema = schemas['parent']
@@ -91,6 +104,21 @@ def routes(app, models, schemas):
         def put(self, id):
             return self.update(id, return_content=True)
 
+    class StringIdParentView(ParentView):
+        related = Related(
+            children=RelatedId(lambda: ChildView(), 'child_string_ids'),
+        )
+
+    class RecordingParentView(ParentView):
+        related = Related(
+            children=RecordingRelatedId(lambda: ChildView(), 'child_ids'),
+        )
+
+    class RecordingNestedParentView(ParentView):
+        related = Related(
+            children=lambda: RecordingChildView(),
+        )
+
     class ParentWithCreateView(ParentView):
         related = Related(
             children=Related(models['child']),
@@ -115,6 +143,13 @@ def routes(app, models, schemas):
         def put(self, id):
             return self.update(id, return_content=True)
 
+    class RecordingChildView(ChildView):
+        def resolve_related_item(self, data, **kwargs):
+            resolved_ids.append(data['id'])
+            return super(RecordingChildView, self).resolve_related_item(
+                data, **kwargs
+            )
+
     class NestedChildView(GenericModelView):
         model = models['child']
         schema = schemas['child']
@@ -129,6 +164,11 @@ def routes(app, models, schemas):
     api = Api(app)
     api.add_resource('/parents/<int:id>', ParentView)
     api.add_resource('/nested_parents/<int:id>', NestedParentView)
+    api.add_resource('/string_id_parents/<int:id>', StringIdParentView)
+    api.add_resource('/recording_parents/<int:id>', RecordingParentView)
+    api.add_resource(
+        '/recording_nested_parents/<int:id>', RecordingNestedParentView,
+    )
     api.add_resource('/parents_with_create/<int:id>', ParentWithCreateView)
     api.add_resource('/children/<int:id>', ChildView)
     api.add_resource('/nested_children/<int:id>', NestedChildView)
@@ -227,6 +267,29 @@ def test_many(client):
     })
 
 
+def test_many_single_query(client, statements):
+    response = client.put('/nested_parents/1', data={
+        'id': '1',
+        'name': "Updated Parent",
+        'children': [
+            {'id': '2'},
+            {'id': '1'},
+        ],
+    })
+
+    assert_response(response, 200, {
+        'children': [
+            {'id': '1'},
+            {'id': '2'},
+        ],
+    })
+    children_statements = [
+        statement for statement in statements
+        if 'WHERE children.id' in statement
+    ]
+    assert len(children_statements) == 1
+
+
 def test_many_nested(client):
     response = client.put('/nested_parents/1', data={
         'id': '1',
@@ -253,6 +316,40 @@ def test_many_nested(client):
     })
 
 
+def test_many_string_ids(client):
+    response = client.put('/string_id_parents/1', data={
+        'id': '1',
+        'name': "Updated Parent",
+        'child_string_ids': ['2', '1'],
+    })
+
+    assert_response(response, 200, {
+        'children': [
+            {'id': '1'},
+            {'id': '2'},
+        ],
+    })
+
+
+@pytest.mark.parametrize('path, related_data', (
+    ('/recording_parents/1', {'child_ids': ['2', '1']}),
+    ('/recording_nested_parents/1', {'children': [{'id': '2'}, {'id': '1'}]}),
+))
+def test_many_overridden_resolver(client, resolved_ids, path, related_data):
+    response = client.put(path, data=dict({
+        'id': '1',
+        'name': "Updated Parent",
+    }, **related_data))
+
+    assert_response(response, 200, {
+        'children': [
+            {'id': '1'},
+            {'id': '2'},
+        ],
+    })
+    assert resolved_ids == [2, 1]
+
+
 def test_many_with_create(client):
     response = client.put('/parents_with_create/1', data={
         'id': '1',
@@ -358,6 +455,18 @@ def test_error_not_found(client):
     }])
 
 
+def test_error_not_found_many(client):
+    response = client.put('/parents/1', data={
+        'id': '1',
+        'name': "Updated Parent",
+        'child_ids': ['1', '3'],
+    })
+    assert_response(response, 422, [{
+        'code': 'invalid_related.not_found',
+        'source': {'pointer': '/data/child_ids'},
+    }])
+
+
 def test_error_not_found_nested(client):
     response = client.put('/nested_children/1', data={
         'id': '1',
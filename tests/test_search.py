@@ -0,0 +1,215 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import query_expression
+
+from flask_resty import (
+    Api,
+    Filtering,
+    Fts5SearchIndex,
+    GenericModelView,
+    RelayCursorPagination,
+    SearchFilter,
+    Sorting,
+    TsvectorSearchIndex,
+)
+from flask_resty.testing import assert_response, get_data, get_meta
+
+# -----------------------------------------------------------------------------
+
+
+def is_sqlite(db):
+    return db.engine.dialect.name == 'sqlite'
+
+
+@pytest.fixture
+def fts5(db):
+    if not is_sqlite(db):
+        pytest.skip("FTS5 requires SQLite")
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        description = Column(String)
+
+        rank = query_expression()
+
+    db.create_all()
+    if is_sqlite(db):
+        db.session.execute(
+            'CREATE VIRTUAL TABLE widgets_fts USING fts5(name, description)',
+        )
+
+    yield {
+        'widget': Widget,
+    }
+
+    if is_sqlite(db):
+        db.session.execute('DROP TABLE widgets_fts')
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String()
+        rank = fields.Float(dump_only=True)
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas):
+    class WidgetListView(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        filtering = Filtering(
+            search=SearchFilter(
+                Fts5SearchIndex('widgets_fts'), rank_field='rank',
+            ),
+        )
+        sorting = Sorting('id', 'name', 'rank')
+        pagination = RelayCursorPagination(1)
+
+        def get(self):
+            return self.list()
+
+    api = Api(app)
+    api.add_resource('/widgets', WidgetListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    widgets = (
+        models['widget'](
+            id=1, name="Foo", description="a red widget",
+        ),
+        models['widget'](
+            id=2, name="Red Red", description="the reddest red widget",
+        ),
+        models['widget'](
+            id=3, name="Bar", description="a blue widget",
+        ),
+        models['widget'](
+            id=4, name="Baz", description="a green widget",
+        ),
+        models['widget'](
+            id=5, name="Qux", description='a "quoted" widget',
+        ),
+    )
+    db.session.add_all(widgets)
+    db.session.flush()
+
+    if not is_sqlite(db):
+        db.session.commit()
+        return
+
+    for widget in widgets:
+        db.session.execute(
+            'INSERT INTO widgets_fts (rowid, name, description) '
+            'VALUES (:id, :name, :description)',
+            {
+                'id': widget.id,
+                'name': widget.name,
+                'description': widget.description,
+            },
+        )
+
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_search(client, fts5):
+    response = client.get('/widgets?search=red&sort=id')
+    assert_response(response, 200, [
+        {'id': '1', 'name': "Foo"},
+    ])
+    assert get_meta(response)['has_next_page'] is True
+
+
+def test_search_multiple_terms(client, fts5):
+    response = client.get('/widgets?search=blue widget')
+    assert_response(response, 200, [
+        {'id': '3', 'name': "Bar"},
+    ])
+
+
+def test_search_rank(client, fts5):
+    response = client.get('/widgets?search=red&sort=-rank')
+    data = get_data(response)
+    assert [item['id'] for item in data] == ['2']
+    assert data[0]['rank'] > 0
+
+
+def test_search_rank_cursor(client, fts5):
+    response = client.get('/widgets?search=red&sort=-rank')
+    cursor = get_meta(response)['cursors'][0]
+
+    response = client.get(
+        '/widgets?search=red&sort=-rank&cursor={}'.format(cursor),
+    )
+    assert_response(response, 200, [
+        {'id': '1', 'name': "Foo"},
+    ])
+    assert get_meta(response)['has_next_page'] is False
+
+
+def test_search_quoted(client, fts5):
+    response = client.get('/widgets?search="quoted" OR')
+    assert_response(response, 200, [])
+
+    response = client.get('/widgets?search="quoted"')
+    assert_response(response, 200, [
+        {'id': '5', 'name': "Qux"},
+    ])
+
+
+@pytest.mark.parametrize('search', ('', '  '))
+def test_search_blank(client, search):
+    response = client.get('/widgets?search={}&sort=id'.format(search))
+    assert_response(response, 200, [
+        {'id': '1', 'name': "Foo", 'rank': None},
+    ])
+
+
+def test_no_search_rank_sort(client):
+    response = client.get('/widgets?sort=rank')
+    assert_response(response, 200)
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_tsvector(models):
+    class View(object):
+        model = models['widget']
+
+    index = TsvectorSearchIndex('description')
+    sql = str(
+        index.get_filter(View, 'red widget').compile(
+            dialect=postgresql.dialect(),
+        ),
+    )
+    assert sql == (
+        'widgets.description @@ '
+        'plainto_tsquery(%(plainto_tsquery_1)s, %(plainto_tsquery_2)s)'
+    )
+
+    sql = str(
+        index.get_rank(View, 'red widget').compile(
+            dialect=postgresql.dialect(),
+        ),
+    )
+    assert sql.startswith('ts_rank(widgets.description, plainto_tsquery(')
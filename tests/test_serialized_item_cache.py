@@ -0,0 +1,159 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import (
+    Api,
+    GenericModelView,
+    MemoryCacheStore,
+    SerializedItemCache,
+)
+from flask_resty.testing import assert_response
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        version = Column(Integer, nullable=False)
+
+        __mapper_args__ = {
+            'version_id_col': version,
+        }
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def dumped_names():
+    return []
+
+
+@pytest.fixture
+def schemas(dumped_names):
+    def dump_name(item):
+        dumped_names.append(item.name)
+        return item.name
+
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.Function(dump_name, lambda value: value)
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture
+def store():
+    return MemoryCacheStore(max_size=2)
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas, store):
+    class WidgetViewBase(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        version_field = 'version'
+        serialized_item_cache = SerializedItemCache(store)
+
+    class WidgetListView(WidgetViewBase):
+        def get(self):
+            return self.list()
+
+    class WidgetView(WidgetViewBase):
+        def get(self, id):
+            return self.retrieve(id)
+
+        def patch(self, id):
+            return self.update(id, partial=True)
+
+        def delete(self, id):
+            return self.destroy(id)
+
+    api = Api(app)
+    api.add_resource(
+        '/widgets', WidgetListView, WidgetView, id_rule='<int:id>',
+    )
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](name="Foo"),
+        models['widget'](name="Bar"),
+        models['widget'](name="Baz"),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_retrieve(client, dumped_names):
+    for _ in range(2):
+        response = client.get('/widgets/1')
+        assert_response(response, 200, {
+            'id': '1',
+            'name': "Foo",
+        })
+
+    assert dumped_names == ["Foo"]
+
+
+def test_list(client, dumped_names):
+    client.get('/widgets/2')
+
+    response = client.get('/widgets')
+    assert_response(response, 200, [
+        {'id': '1', 'name': "Foo"},
+        {'id': '2', 'name': "Bar"},
+        {'id': '3', 'name': "Baz"},
+    ])
+
+    # Only uncached items are dumped.
+    assert dumped_names == ["Bar", "Foo", "Baz"]
+
+
+def test_eviction(client, store):
+    client.get('/widgets')
+    assert len(store) == 2
+
+
+def test_update(client, dumped_names, store):
+    client.get('/widgets/1')
+
+    update_response = client.patch('/widgets/1', data={
+        'id': '1',
+        'name': "Qux",
+    })
+    assert_response(update_response, 204)
+    assert len(store) == 0
+
+    response = client.get('/widgets/1')
+    assert_response(response, 200, {
+        'id': '1',
+        'name': "Qux",
+    })
+    assert dumped_names == ["Foo", "Qux"]
+
+
+def test_destroy(client, store):
+    client.get('/widgets/1')
+    assert len(store) == 1
+
+    destroy_response = client.delete('/widgets/1')
+    assert_response(destroy_response, 204)
+    assert len(store) == 0
@@ -0,0 +1,221 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from flask_resty import (
+    Api,
+    ApiView,
+    GenericModelView,
+    LoadPlanner,
+    RelatedItem,
+)
+from flask_resty.testing import assert_response, get_data
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        description = Column(String)
+
+        parts = relationship('Part')
+
+    class Part(db.Model):
+        __tablename__ = 'parts'
+
+        id = Column(Integer, primary_key=True)
+        widget_id = Column(ForeignKey(Widget.id))
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+        'part': Part,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class SparsePartSchema(Schema):
+        id = fields.Integer(as_string=True)
+
+    class SparseWidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String()
+        description = fields.String()
+        secret = fields.String(load_only=True)
+
+        parts = RelatedItem(SparsePartSchema, many=True)
+
+    return {
+        'widget': SparseWidgetSchema(),
+    }
+
+
+@pytest.fixture
+def serializers():
+    return []
+
+
+@pytest.fixture
+def load_planner():
+    return LoadPlanner(load_only=True, max_size=2)
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas, serializers, load_planner):
+    widget_load_planner = load_planner
+
+    class WidgetViewBase(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        fields_arg = 'fields'
+        sparse_load_planner = widget_load_planner
+
+    class WidgetListView(WidgetViewBase):
+        def get(self):
+            serializers.append(self.serializer)
+            return self.list()
+
+    class WidgetView(WidgetViewBase):
+        def get(self, id):
+            return self.retrieve(id)
+
+    api = Api(app)
+    api.add_resource(
+        '/widgets', WidgetListView, WidgetView, id_rule='<int:id>',
+    )
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](name="Foo", description="foo widget", parts=[
+            models['part'](),
+        ]),
+        models['widget'](name="Bar", description="bar widget"),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_all_fields(client):
+    response = client.get('/widgets')
+    assert get_data(response) == [
+        {
+            'id': '1',
+            'name': "Foo",
+            'description': "foo widget",
+            'parts': [{'id': '1'}],
+        },
+        {
+            'id': '2',
+            'name': "Bar",
+            'description': "bar widget",
+            'parts': [],
+        },
+    ]
+
+
+def test_list(client, statements):
+    response = client.get('/widgets?fields=name')
+    assert get_data(response) == [
+        {'id': '1', 'name': "Foo"},
+        {'id': '2', 'name': "Bar"},
+    ]
+
+    # Neither unused columns nor unused relationships are loaded.
+    assert len(statements) == 1
+    assert 'description' not in statements[0]
+
+
+def test_retrieve(client, statements):
+    response = client.get('/widgets/1?fields=description')
+    assert get_data(response) == {'id': '1', 'description': "foo widget"}
+
+    assert len(statements) == 1
+    assert 'name' not in statements[0]
+
+
+def test_relationship(client, statements):
+    response = client.get('/widgets?fields=parts')
+    assert get_data(response) == [
+        {'id': '1', 'parts': [{'id': '1'}]},
+        {'id': '2', 'parts': []},
+    ]
+
+    # The relationship is eagerly loaded.
+    assert len(statements) == 2
+
+
+def test_serializer_cached(client, serializers):
+    client.get('/widgets?fields=name,description')
+    client.get('/widgets?fields=description,name')
+    client.get('/widgets?fields=name')
+
+    assert serializers[0] is serializers[1]
+    assert serializers[0] is not serializers[2]
+
+
+def test_load_planner_bounded(client, load_planner):
+    for field_names in ('name', 'description', 'name,description', 'parts'):
+        response = client.get('/widgets?fields={}'.format(field_names))
+        assert response.status_code == 200
+
+    assert len(load_planner._query_options) == 2
+
+
+def test_serializer_state():
+    class LabeledSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String()
+        description = fields.String()
+
+        def __init__(self, label, **kwargs):
+            super(LabeledSchema, self).__init__(**kwargs)
+            self.label = label
+
+    schema = LabeledSchema('foo', many=True, partial=True, context={'a': 1})
+
+    class LabeledView(ApiView):
+        pass
+
+    LabeledView.schema = schema
+    sparse_serializer = LabeledView.get_request_plan().get_sparse_serializer(
+        LabeledView(), frozenset(('id', 'name')),
+    )
+
+    assert isinstance(sparse_serializer, LabeledSchema)
+    assert sparse_serializer.label == 'foo'
+    assert sparse_serializer.many is True
+    assert sparse_serializer.partial is True
+    assert sparse_serializer.context is schema.context
+    assert set(sparse_serializer.fields) == {'id', 'name'}
+
+    # The original schema and its fields are unchanged.
+    assert set(schema.fields) == {'id', 'name', 'description'}
+    assert schema.fields['name'].parent is schema
+    assert sparse_serializer.fields['name'].parent is sparse_serializer
+
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize('field_name', ('foo', 'secret'))
+def test_error_invalid_field(client, field_name):
+    response = client.get('/widgets?fields=name,{}'.format(field_name))
+    assert_response(response, 400, [{
+        'code': 'invalid_fields',
+        'source': {'parameter': 'fields'},
+    }])
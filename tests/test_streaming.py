@@ -0,0 +1,115 @@
+from marshmallow import fields, Schema
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_resty import Api, GenericModelView, LimitPagination
+from flask_resty.testing import assert_response, get_meta
+
+# -----------------------------------------------------------------------------
+
+
+@pytest.yield_fixture
+def models(db):
+    class Widget(db.Model):
+        __tablename__ = 'widgets'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String, nullable=False)
+
+    db.create_all()
+
+    yield {
+        'widget': Widget,
+    }
+
+    db.drop_all()
+
+
+@pytest.fixture
+def schemas():
+    class WidgetSchema(Schema):
+        id = fields.Integer(as_string=True)
+        name = fields.String(required=True)
+
+    return {
+        'widget': WidgetSchema(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def routes(app, models, schemas):
+    class WidgetListView(GenericModelView):
+        model = models['widget']
+        schema = schemas['widget']
+
+        stream_chunk_size = 2
+
+        def get(self):
+            return self.list(stream=True)
+
+    class PaginatedWidgetListView(WidgetListView):
+        pagination = LimitPagination()
+
+    api = Api(app)
+    api.add_resource('/widgets', WidgetListView)
+    api.add_resource('/paginated_widgets', PaginatedWidgetListView)
+
+
+@pytest.fixture(autouse=True)
+def data(db, models):
+    db.session.add_all((
+        models['widget'](name="Foo"),
+        models['widget'](name="Bar"),
+        models['widget'](name="Baz"),
+    ))
+    db.session.commit()
+
+
+# -----------------------------------------------------------------------------
+
+
+def test_list(client):
+    response = client.get('/widgets')
+
+    assert response.is_streamed
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Foo",
+        },
+        {
+            'id': '2',
+            'name': "Bar",
+        },
+        {
+            'id': '3',
+            'name': "Baz",
+        },
+    ])
+
+
+def test_list_empty(client, db, models):
+    models['widget'].query.delete()
+    db.session.commit()
+
+    response = client.get('/widgets')
+    assert_response(response, 200, [])
+
+
+def test_list_paginated(client):
+    response = client.get('/paginated_widgets?limit=2')
+
+    assert response.is_streamed
+    assert_response(response, 200, [
+        {
+            'id': '1',
+            'name': "Foo",
+        },
+        {
+            'id': '2',
+            'name': "Bar",
+        },
+    ])
+    assert get_meta(response) == {
+        'has_next_page': True,
+    }
@@ -7,6 +7,7 @@ from flask_resty import (
     Api,
     Filtering,
     GenericModelView,
+    OperatorFilters,
     PagePagination,
     RelayCursorPagination,
     Sorting,
@@ -45,6 +46,7 @@ def views(schemas):
 
         filtering = Filtering(
             color=operator.eq,
+            name=OperatorFilters(operators=('prefix',)),
         )
         sorting = Sorting('name', 'color')
         pagination = PagePagination(2)
@@ -322,6 +324,17 @@ def test_filters(spec):
     assert parameter in foos_get['parameters']
 
 
+def test_operator_filters(spec):
+    foos_get = spec['paths']['/foos']['get']
+
+    parameter = {
+        'in': 'query',
+        'name': 'name[prefix]',
+        'type': 'string',
+    }
+    assert parameter in foos_get['parameters']
+
+
 def test_docstring(spec):
     foos_post = spec['paths']['/foos']['post']
     assert foos_post['description'] == "test the docstring"
@@ -313,3 +313,15 @@ def test_debug(app, client):
     )
     assert_response(testing_response, 400)
     assert 'debug' in get_body(testing_response)
+
+
+def test_debug_disabled(app, client):
+    app.config['RESTY_ERROR_TRACEBACKS'] = False
+
+    response = client.post(
+        '/widgets',
+        content_type='text',
+        data='foo',
+    )
+    assert_response(response, 400)
+    assert 'debug' not in get_body(response)